@@ -2,14 +2,74 @@ from dataclasses import dataclass
 from datetime import date, time
 from typing import Optional
 from decimal import Decimal
+import sys
 
-@dataclass
+# Decimal cero compartido: Decimal es inmutable, así que todos los campos
+# monetarios pueden apuntar al mismo objeto como default sin riesgo.
+_ZERO = Decimal(0)
+
+# Defaults de campos tipo enum, internados: miles de DTOs comparten el mismo
+# objeto str canónico y las comparaciones posteriores aciertan por identidad.
+_TIPO_P = sys.intern('P')
+_DIVISA_COP = sys.intern('COP')
+_ESTADO_PROVISION = sys.intern('ProvisionEnProceso')
+_TIPO_CHECKIN = sys.intern('Checkin')
+
+# Mapa único atributo -> clave JSON (y conversión opcional) usado por to_dict.
+# Mantenerlo a nivel de módulo evita reconstruir la traducción en cada llamada
+# y deja una sola fuente de verdad para el contrato con el microservicio.
+# Las claves se internan al final del módulo para que todos los payloads
+# compartan los mismos objetos str canónicos.
+_TO_DICT_SPEC = (
+    ("NumeroPedido", "numero_pedido", None),
+    ("CodCliente", "cod_cliente", None),
+    ("CodOsCliente", "cod_os_cliente", None),
+    ("CodSucursal", "cod_sucursal", None),
+    ("FechaSolicitud", "fecha_solicitud", None),
+    ("HoraSolicitud", "hora_solicitud", None),
+    ("FechaProgramacion", "fecha_programacion", None),
+    ("HoraProgramacion", "hora_programacion", None),
+    ("CodConcepto", "cod_concepto", None),
+    ("TipoTraslado", "tipo_traslado", None),
+    ("CodPuntoOrigen", "cod_punto_origen", None),
+    ("IndicadorTipoOrigen", "indicador_tipo_origen", None),
+    ("CodPuntoDestino", "cod_punto_destino", None),
+    ("IndicadorTipoDestino", "indicador_tipo_destino", None),
+    ("ModalidadServicio", "modalidad_servicio", None),
+    ("Observaciones", "observaciones", None),
+    ("ValorBillete", "valor_billete", float),
+    ("ValorMoneda", "valor_moneda", float),
+    ("ValorServicio", "valor_servicio", float),
+    ("NumeroKitsCambio", "numero_kits_cambio", None),
+    ("NumeroBolsasMoneda", "numero_bolsas_moneda", None),
+    ("CefCodRuta", "cef_cod_ruta", None),
+    ("CefNumeroPlanilla", "cef_numero_planilla", None),
+    ("CefDivisa", "cef_divisa", None),
+    ("CefTipoTransaccion", "cef_tipo_transaccion", None),
+    ("CefEstadoTransaccion", "cef_estado_transaccion", None),
+    ("CantidadBolsasDeclaradas", "cantidad_bolsas_declaradas", None),
+    ("CantidadSobresDeclarados", "cantidad_sobres_declarados", None),
+    ("CantidadChequesDeclarados", "cantidad_cheques_declarados", None),
+    ("CantidadDocumentosDeclarados", "cantidad_documentos_declarados", None),
+    ("ValorBilletesDeclarado", "valor_billetes_declarado", float),
+    ("ValorMonedasDeclarado", "valor_monedas_declarado", float),
+    ("ValorTotalDeclarado", "valor_total_declarado", float),
+    ("ValorTotalDeclaradoLetras", "valor_total_declarado_letras", None),
+    ("CefEsCustodia", "cef_es_custodia", None),
+    ("CefEsPuntoAPunto", "cef_es_punto_a_punto", None),
+)
+_TO_DICT_SPEC = tuple((sys.intern(key), attr, conv) for key, attr, conv in _TO_DICT_SPEC)
+
+@dataclass(slots=True)
 class AetherServiceImportDto:
     """
     Data Transfer Object para datos de servicio.
-    
+
     Representa los datos necesarios para insertar un servicio mediante
     el stored procedure AddServiceTransaction.
+
+    Usa slots para reducir la memoria por instancia y acelerar el acceso
+    a atributos durante las cargas masivas (miles de DTOs por archivo).
     """
     # --- Datos del Servicio (CgsServicios) ---
     cod_cliente: int
@@ -21,78 +81,73 @@ class AetherServiceImportDto:
     cod_concepto: int
     cod_punto_origen: str
     cod_punto_destino: str
-    
+
     numero_pedido: Optional[str] = None
     cod_os_cliente: Optional[str] = None
-    tipo_traslado: str = 'P'
-    indicador_tipo_origen: str = 'P'
-    indicador_tipo_destino: str = 'P'
+    tipo_traslado: str = _TIPO_P
+    indicador_tipo_origen: str = _TIPO_P
+    indicador_tipo_destino: str = _TIPO_P
     modalidad_servicio: Optional[str] = None
     observaciones: str = ""
-    
-    valor_billete: Decimal = Decimal('0')
-    valor_moneda: Decimal = Decimal('0')
-    valor_servicio: Decimal = Decimal('0')
+
+    valor_billete: Decimal = _ZERO
+    valor_moneda: Decimal = _ZERO
+    valor_servicio: Decimal = _ZERO
     numero_kits_cambio: int = 0
     numero_bolsas_moneda: int = 0
 
     # --- Datos de Transacción (CefTransacciones) ---
     cef_cod_ruta: Optional[str] = None
     cef_numero_planilla: int = 0
-    cef_divisa: str = "COP"
-    cef_estado_transaccion: str = "ProvisionEnProceso"
-    cef_tipo_transaccion: str = "Checkin"
-    
+    cef_divisa: str = _DIVISA_COP
+    cef_estado_transaccion: str = _ESTADO_PROVISION
+    cef_tipo_transaccion: str = _TIPO_CHECKIN
+
     cantidad_bolsas_declaradas: int = 0
     cantidad_sobres_declarados: int = 0
     cantidad_cheques_declarados: int = 0
     cantidad_documentos_declarados: int = 0
-    
-    valor_billetes_declarado: Decimal = Decimal('0')
-    valor_monedas_declarado: Decimal = Decimal('0')
-    valor_total_declarado: Decimal = Decimal('0')
+
+    valor_billetes_declarado: Decimal = _ZERO
+    valor_monedas_declarado: Decimal = _ZERO
+    valor_total_declarado: Decimal = _ZERO
     valor_total_declarado_letras: Optional[str] = None
-    
+
     cef_es_custodia: bool = False
     cef_es_punto_a_punto: bool = False
-    
+
     def to_dict(self):
         """Convierte el DTO a un diccionario listo para enviar como JSON"""
         return {
-            "NumeroPedido": self.numero_pedido,
-            "CodCliente": self.cod_cliente,
-            "CodOsCliente": self.cod_os_cliente,
-            "CodSucursal": self.cod_sucursal,
-            "FechaSolicitud": self.fecha_solicitud,
-            "HoraSolicitud": self.hora_solicitud,
-            "FechaProgramacion": self.fecha_programacion,
-            "HoraProgramacion": self.hora_programacion,
-            "CodConcepto": self.cod_concepto,
-            "TipoTraslado": self.tipo_traslado,
-            "CodPuntoOrigen": self.cod_punto_origen,
-            "IndicadorTipoOrigen": self.indicador_tipo_origen,
-            "CodPuntoDestino": self.cod_punto_destino,
-            "IndicadorTipoDestino": self.indicador_tipo_destino,
-            "ModalidadServicio": self.modalidad_servicio,
-            "Observaciones": self.observaciones,
-            "ValorBillete": float(self.valor_billete),
-            "ValorMoneda": float(self.valor_moneda),
-            "ValorServicio": float(self.valor_servicio),
-            "NumeroKitsCambio": self.numero_kits_cambio,
-            "NumeroBolsasMoneda": self.numero_bolsas_moneda,
-            "CefCodRuta": self.cef_cod_ruta,
-            "CefNumeroPlanilla": self.cef_numero_planilla,
-            "CefDivisa": self.cef_divisa,
-            "CefTipoTransaccion": self.cef_tipo_transaccion,
-            "CefEstadoTransaccion": self.cef_estado_transaccion,
-            "CantidadBolsasDeclaradas": self.cantidad_bolsas_declaradas,
-            "CantidadSobresDeclarados": self.cantidad_sobres_declarados,
-            "CantidadChequesDeclarados": self.cantidad_cheques_declarados,
-            "CantidadDocumentosDeclarados": self.cantidad_documentos_declarados,
-            "ValorBilletesDeclarado": float(self.valor_billetes_declarado),
-            "ValorMonedasDeclarado": float(self.valor_monedas_declarado),
-            "ValorTotalDeclarado": float(self.valor_total_declarado),
-            "ValorTotalDeclaradoLetras": self.valor_total_declarado_letras,
-            "CefEsCustodia": self.cef_es_custodia,
-            "CefEsPuntoAPunto": self.cef_es_punto_a_punto
-        }
\ No newline at end of file
+            key: conv(getattr(self, attr)) if conv else getattr(self, attr)
+            for key, attr, conv in _TO_DICT_SPEC
+        }
+
+
+def _generar_to_dict():
+    """
+    Genera una versión especializada de to_dict a partir de _TO_DICT_SPEC.
+
+    El cuerpo resultante es un único literal de diccionario con los accesos a
+    atributo en línea (sin getattr ni iteración por el spec), de modo que cada
+    llamada compila a un solo BUILD_MAP con claves constantes. Se ejecuta una
+    sola vez al importar el módulo.
+    """
+    entradas = []
+    for key, attr, conv in _TO_DICT_SPEC:
+        valor = f"self.{attr}"
+        if conv is not None:
+            valor = f"{conv.__name__}({valor})"
+        entradas.append(f"    {key!r}: {valor},")
+
+    fuente = "def to_dict(self):\n    return {\n" + "\n".join(entradas) + "\n    }\n"
+    ambito = {"float": float}
+    exec(compile(fuente, __file__, "exec"), ambito)
+    to_dict = ambito["to_dict"]
+    to_dict.__doc__ = AetherServiceImportDto.to_dict.__doc__
+    to_dict.__qualname__ = "AetherServiceImportDto.to_dict"
+    return to_dict
+
+
+# Reemplaza la versión genérica por la especializada generada en import.
+AetherServiceImportDto.to_dict = _generar_to_dict()
@@ -4,74 +4,76 @@ Interfaz para escritura en base de datos (Dependency Inversion Principle).
 Define el contrato que deben implementar los repositorios de escritura,
 permitiendo que la capa de aplicación dependa de abstracciones.
 """
-from abc import ABC, abstractmethod
-from typing import Optional
+from __future__ import annotations
+from typing import Optional, Protocol, TYPE_CHECKING
 
-from ..dto.servicio_dto import ServicioDTO
-from ..dto.transaccion_dto import TransaccionDTO
+if TYPE_CHECKING:
+    # Solo se necesita para las anotaciones (strings en runtime): evita cargar
+    # el módulo del DTO — y decimal con él — al importar la interfaz.
+    from ..dto.servicio_dto import AetherServiceImportDto
 
 
-class IDatabaseWriter(ABC):
+class IDatabaseWriter(Protocol):
     """
     Interfaz para escritura de servicios y transacciones en base de datos.
-    
+
     Esta interfaz define el contrato para insertar datos en la BD,
     sin exponer detalles de implementación (stored procedures, queries, etc.).
+
+    Al ser un Protocol (tipado estructural, PEP 544) las implementaciones no
+    heredan de esta clase: basta con exponer los métodos. Eso evita el paso
+    por ABCMeta al instanciar cada writer y en los isinstance.
     """
-    
-    @abstractmethod
+
     def insertar_servicio_con_transaccion(
         self,
-        servicio_dto: ServicioDTO,
-        transaccion_dto: TransaccionDTO
+        servicio_dto: AetherServiceImportDto
     ) -> Optional[str]:
         """
         Inserta un servicio junto con su transacción CEF en la base de datos.
-        
+
         Args:
-            servicio_dto: DTO con datos del servicio
-            transaccion_dto: DTO con datos de la transacción
-            
+            servicio_dto: DTO unificado con datos del servicio y su transacción
+
         Returns:
             Orden de Servicio generada (ej: "S-000123") o None si falla
-            
+
         Raises:
             DatabaseWriteException: Si ocurre un error durante la inserción
-            
+
         Notes:
             Esta operación debe ser atómica (transacción de BD).
             Si falla la inserción del servicio o la transacción,
             ambas deben revertirse (rollback).
         """
-        pass
-    
-    @abstractmethod
+        ...
+
     def verificar_servicio_existe(self, numero_pedido: str) -> bool:
         """
         Verifica si un servicio ya existe en la base de datos.
-        
+
         Args:
             numero_pedido: Número de pedido a verificar
-            
+
         Returns:
             True si el servicio ya existe, False en caso contrario
-            
+
         Notes:
             Útil para evitar duplicados antes de insertar.
         """
-        pass
+        ...
 
 
 class DatabaseWriteException(Exception):
     """
     Excepción lanzada cuando falla una operación de escritura en BD.
-    
+
     Attributes:
         message: Descripción del error
         inner_exception: Excepción original (si existe)
         orden_servicio: Orden de servicio afectada (si aplica)
     """
-    
+
     def __init__(
         self,
         message: str,
@@ -82,11 +84,17 @@ class DatabaseWriteException(Exception):
         self.message = message
         self.inner_exception = inner_exception
         self.orden_servicio = orden_servicio
-    
-    def __str__(self) -> str:
-        result = self.message
+        # Los bucles de reintento + logging re-stringifican la excepción
+        # varias veces; el mensaje se renderiza una sola vez aquí.
+        self._rendered = self._build_message()
+
+    def _build_message(self) -> str:
+        partes = [self.message]
         if self.orden_servicio:
-            result += f" (Orden: {self.orden_servicio})"
+            partes.append(f" (Orden: {self.orden_servicio})")
         if self.inner_exception:
-            result += f" - Error original: {self.inner_exception}"
-        return result
\ No newline at end of file
+            partes.append(f" - Error original: {self.inner_exception}")
+        return ''.join(partes)
+
+    def __str__(self) -> str:
+        return self._rendered
@@ -26,4 +26,4 @@ class BaseExcelMapper(ABC):
         """
         Retorna una lista de tuplas (DTO_UNIFICADO, indice_fila)
         """
-        pass
\ No newline at end of file
+        pass
@@ -1,23 +1,52 @@
 import logging
+import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from src.domain.value_objects.cliente_folder import ClienteFolder
 from src.infrastructure.file_system.path_manager import PathManager
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=256)
+def _parse_cliente_folder(nombre: str) -> ClienteFolder:
+    """
+    ClienteFolder memoizado por nombre de carpeta: en ráfagas del watcher la
+    misma carpeta de cliente se parsea decenas de veces. ClienteFolder es
+    inmutable (frozen), así que compartir la instancia es seguro.
+    """
+    return ClienteFolder.from_folder_name(nombre)
+
 class ProcessingOrchestrator:
     def __init__(
         self,
         excel_processor,
         path_manager: PathManager,
         watcher_factory,
-        debounce_ms=800
+        debounce_ms=800,
+        max_workers: int | None = None
     ):
         self.excel_processor = excel_processor
         self.path_manager = path_manager
         self.watcher_factory = watcher_factory
         self.debounce_ms = debounce_ms
+        # Los archivos son independientes entre sí: procesarlos en un pool
+        # evita que un Excel grande bloquee al watcher y al resto de la cola.
+        # Hilos (no procesos) porque el procesador comparte la sesión HTTP
+        # autenticada de ApiService, que no es picklable.
+        workers = max_workers or min(4, os.cpu_count() or 1)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="excel-worker"
+        )
+        # La cola interna del executor es ilimitada: tras un arranque con
+        # backlog grande, el primer escaneo del watcher encolaría todo de
+        # golpe. El semáforo acota los envíos en vuelo (productor bloquea,
+        # estilo cola acotada) y mantiene la memoria constante.
+        self._en_vuelo = threading.BoundedSemaphore(2 * workers)
 
     def start(self):
         """Inicia el monitoreo de la carpeta de entrada configurada."""
@@ -34,14 +63,20 @@ class ProcessingOrchestrator:
     def on_file_detected(self, file_path: str):
         ruta = Path(file_path)
         logger.info(f"📂 Archivo detectado: {ruta.name}")
+        self._en_vuelo.acquire()
+        try:
+            self._executor.submit(self._procesar_archivo, ruta)
+        except BaseException:
+            self._en_vuelo.release()
+            raise
 
+    def _procesar_archivo(self, ruta: Path):
         try:
-            solicitud_name = ruta.parent.name
             cliente_name = ruta.parent.parent.name
-            
-            cliente_folder = ClienteFolder.from_folder_name(cliente_name)
 
-            exito = self.excel_processor.procesar_archivo_excel(ruta, cliente_folder, solicitud_name)
+            cliente_folder = _parse_cliente_folder(cliente_name)
+
+            exito = self.excel_processor.procesar_archivo_excel(ruta, cliente_folder)
             if exito:
                 logger.info(f"✅ Procesamiento exitoso: {ruta.name}")
             else:
@@ -50,11 +85,24 @@ class ProcessingOrchestrator:
         except Exception as e:
             logger.error(f"❌ Error crítico en el orquestador: {e}")
             self._mover_a_emergencia(ruta)
+        finally:
+            self._en_vuelo.release()
+
+    def shutdown(self, wait: bool = True):
+        """Detiene el pool de procesamiento (espera los archivos en curso)."""
+        self._executor.shutdown(wait=wait)
+        _parse_cliente_folder.cache_clear()
 
     def _mover_a_emergencia(self, ruta: Path):
         try:
             error_dir = ruta.parent / "errores"
             error_dir.mkdir(parents=True, exist_ok=True)
-            shutil.move(str(ruta), str(error_dir / ruta.name))
+            destino = error_dir / ruta.name
+            # Rename de inodo en el mismo filesystem; shutil.move solo si el
+            # destino está en otro dispositivo (EXDEV).
+            try:
+                os.replace(str(ruta), str(destino))
+            except OSError:
+                shutil.move(str(ruta), str(destino))
         except:
             pass
@@ -2,17 +2,48 @@
 Lector de archivos Excel para procesamiento de solicitudes.
 """
 from __future__ import annotations
+import importlib.util
 import keyword
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 import pandas as pd
 import logging
+import re
+import threading
 import warnings
 
 warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
 
 logger = logging.getLogger(__name__)
 
+# Motor calamine (Rust) si está instalado: parsea el XML varias veces más
+# rápido y con menos memoria que openpyxl. Se detecta una sola vez al importar;
+# sin el paquete se usan los motores de siempre (openpyxl / xlrd).
+_CALAMINE = importlib.util.find_spec('python_calamine') is not None
+
+# Colapsa espacios internos de los encabezados en una sola pasada de regex.
+_HEADER_WS_RE = re.compile(r'\s+')
+
+
+def _engine_para(extension: str) -> str:
+    """Motor de pandas a usar para una extensión ('.xlsx', '.xls', ...)."""
+    if _CALAMINE:
+        return 'calamine'
+    return 'openpyxl' if extension in ('.xlsx', '.xlsm') else 'xlrd'
+
+
+@lru_cache(maxsize=128)
+def _cached_sheet_names(path_str: str, mtime_ns: int, engine: str) -> tuple[str, ...]:
+    """
+    Nombres de hoja memoizados por (ruta, mtime): listar hojas del mismo
+    archivo sin cambios no vuelve a abrir el zip. Abre y cierra su propio
+    handle para no depender del ciclo de vida del cache de ExcelFile.
+    """
+    with pd.ExcelFile(path_str, engine=engine) as xf:
+        return tuple(xf.sheet_names)
+
+
 class ExcelFileReader:
     """
     Lector robusto de archivos Excel.
@@ -39,10 +70,77 @@ class ExcelFileReader:
         'NUMERO KITS',
         'NÚMERO KITS'
     ]
-    
+
+    # Versión frozenset de las keywords: la detección de encabezados hace una
+    # intersección hasheada por fila en vez de O(cols × keywords) escaneos.
+    KEYWORDS_HEADER_SET = frozenset(KEYWORDS_HEADER)
+
+    # Extensiones soportadas como frozenset a nivel de clase: la membresía es
+    # O(1) y no se reconstruye la lista en cada llamada a read().
+    EXTENSIONES_SOPORTADAS = frozenset({'.xlsx', '.xls', '.xlsm'})
+
     def __init__(self):
         """Inicializa el lector"""
         self._encodings = ['utf-8', 'latin-1', 'iso-8859-1']
+        # Cache de handles pd.ExcelFile por (ruta, mtime, tamaño): evita
+        # re-abrir el zip y re-parsear shared strings cuando el mismo archivo
+        # se consulta varias veces (list_sheets + read_multiple_sheets).
+        self._excel_cache: dict[tuple[str, int, int], pd.ExcelFile] = {}
+        self._cache_lock = threading.Lock()
+
+    def _abrir_excel(self, ruta_excel: Path) -> pd.ExcelFile:
+        """
+        Devuelve un pd.ExcelFile cacheado para la ruta.
+
+        La clave incluye mtime y tamaño: si el archivo cambió en disco, la
+        entrada vieja se cierra y se reabre. Llamar a close(ruta) al terminar
+        de procesar un archivo para liberar su handle.
+        """
+        st = ruta_excel.stat()
+        key = (str(ruta_excel), st.st_mtime_ns, st.st_size)
+        engine = _engine_para(ruta_excel.suffix.lower())
+
+        with self._cache_lock:
+            handle = self._excel_cache.get(key)
+            if handle is None:
+                # Purga versiones viejas del mismo archivo
+                for vieja in [k for k in self._excel_cache if k[0] == key[0]]:
+                    try:
+                        self._excel_cache.pop(vieja).close()
+                    except Exception:
+                        pass
+                handle = pd.ExcelFile(ruta_excel, engine=engine)
+                self._excel_cache[key] = handle
+            return handle
+
+    def close(self, ruta_excel: Path):
+        """
+        Cierra y descarta los handles cacheados de una ruta concreta.
+
+        El lector se comparte entre los workers del pool: cerrar solo el
+        archivo propio evita tumbar handles que otro worker está leyendo.
+        """
+        with self._cache_lock:
+            for key in [k for k in self._excel_cache if k[0] == str(ruta_excel)]:
+                try:
+                    self._excel_cache.pop(key).close()
+                except Exception:
+                    pass
+
+    def close_all(self):
+        """
+        Cierra y descarta todos los handles de Excel cacheados.
+
+        Solo para el apagado del servicio: durante la operación normal cada
+        worker debe liberar su archivo con close(ruta).
+        """
+        with self._cache_lock:
+            for handle in self._excel_cache.values():
+                try:
+                    handle.close()
+                except Exception:
+                    pass
+            self._excel_cache.clear()
 
     def read(
         self,
@@ -78,7 +176,7 @@ class ExcelFileReader:
             logger.warning(f"Archivo Excel vacío: {ruta_excel.name}")
             return self._build_empty_result(ruta_excel)
         
-        if ruta_excel.suffix.lower() not in ['.xlsx', '.xls', '.xlsm']:
+        if ruta_excel.suffix.lower() not in self.EXTENSIONES_SOPORTADAS:
             error_msg = f"Extensión no soportada: {ruta_excel.suffix}"
             logger.error(error_msg)
             return self._build_error_result(ruta_excel, error_msg)
@@ -87,31 +185,25 @@ class ExcelFileReader:
             logger.info(f"Leyendo archivo Excel: {ruta_excel.name}")
 
             extension = ruta_excel.suffix.lower()
-            engine = 'openpyxl' if extension == '.xlsx' else 'xlrd'
-
-            if hoja is not None:
-                df = pd.read_excel(
-                    ruta_excel,
-                    sheet_name=hoja,
-                    engine=engine,
-                    dtype=str,
-                    na_filter=False
-                )
-                sheet_name = str(hoja)
+
+            if extension in ('.xlsx', '.xlsm') and not _CALAMINE:
+                df, sheet_name = self._leer_hoja_streaming(ruta_excel, hoja)
             else:
-                with pd.ExcelFile(ruta_excel, engine=engine) as excel_file:
-                    first_sheet = excel_file.sheet_names[0]
-                    df = pd.read_excel(
-                        excel_file,
-                        sheet_name=first_sheet,
-                        dtype=str,
-                        na_filter=False
-                    )
-                    sheet_name = first_sheet
+                # Con calamine el parseo completo ya es más rápido y liviano
+                # que el streaming de openpyxl. Para .xls, un único handle
+                # cacheado resuelve nombre de hoja y parseo, sin el doble
+                # open de pd.ExcelFile + pd.read_excel.
+                xf = self._abrir_excel(ruta_excel)
+                hoja_a_leer = hoja if hoja is not None else xf.sheet_names[0]
+                df = xf.parse(hoja_a_leer, dtype=str, na_filter=False)
+                sheet_name = str(hoja_a_leer)
 
             df = self._encontrar_y_ajustar_header(df)
-            df.columns = [self._limpiar_header(col) for col in df.columns]
-            df = df.dropna(how='all')
+            df.columns = self._limpiar_headers(df.columns)
+            # Con celdas normalizadas a str las filas vacías contienen '', no
+            # NaN: una máscara directa sobre el ndarray es una sola pasada.
+            if not df.empty:
+                df = df.loc[(df.to_numpy() != '').any(axis=1)]
 
             if df.empty:
                 logger.warning(f"Excel sin datos después de limpieza: {ruta_excel.name}")
@@ -141,6 +233,63 @@ class ExcelFileReader:
             logger.error(error_msg, exc_info=True)
             return self._build_error_result(ruta_excel, error_msg)
 
+    def _leer_hoja_streaming(
+        self,
+        ruta_excel: Path,
+        hoja: Optional[str | int] = None
+    ) -> tuple[pd.DataFrame, str]:
+        """
+        Lee una hoja .xlsx/.xlsm con openpyxl en modo read_only.
+
+        Las filas se consumen de forma perezosa (iter_rows) en lugar de dejar
+        que pandas materialice el libro completo, lo que recorta el pico de
+        memoria en los archivos grandes de solicitudes. La primera fila se usa
+        como encabezado provisional, igual que hacía pd.read_excel; la
+        detección real del header ocurre después en _encontrar_y_ajustar_header.
+
+        Returns:
+            (DataFrame con celdas como str y vacíos como '', nombre de hoja)
+        """
+        import openpyxl
+
+        wb = openpyxl.load_workbook(
+            ruta_excel, read_only=True, data_only=True, keep_links=False
+        )
+        try:
+            if hoja is None:
+                ws = wb[wb.sheetnames[0]]
+            elif isinstance(hoja, int):
+                ws = wb[wb.sheetnames[hoja]]
+            else:
+                ws = wb[hoja]
+
+            rows = ws.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return pd.DataFrame(), ws.title
+
+            # En read_only las filas pueden venir recortadas: se normaliza el
+            # ancho contra las dimensiones declaradas de la hoja.
+            ancho = max(ws.max_column or 0, len(header))
+            relleno = ('',) * ancho
+
+            def _normalizar(fila):
+                # Equivalente a dtype=str + na_filter=False: str y vacíos = ''
+                limpia = tuple('' if c is None else str(c) for c in fila)
+                if len(limpia) < ancho:
+                    limpia += relleno[len(limpia):]
+                return limpia[:ancho]
+
+            columnas = list(_normalizar(header))
+            df = pd.DataFrame(
+                (_normalizar(fila) for fila in rows),
+                columns=columnas,
+                dtype=object
+            )
+            return df, ws.title
+        finally:
+            wb.close()
+
     def list_sheets(self, ruta_excel: Path) -> list[str]:
         """
         Lista todas las hojas disponibles en el Excel.
@@ -152,9 +301,9 @@ class ExcelFileReader:
             Lista de nombres de hojas
         """
         try:
-            engine = 'openpyxl' if ruta_excel.suffix == '.xlsx' else 'xlrd'
-            excel_file = pd.ExcelFile(ruta_excel, engine=engine)
-            return excel_file.sheet_names
+            st = ruta_excel.stat()
+            engine = _engine_para(ruta_excel.suffix.lower())
+            return list(_cached_sheet_names(str(ruta_excel), st.st_mtime_ns, engine))
         except Exception as e:
             logger.error(f"Error listando hojas de {ruta_excel.name}: {e}")
             return []
@@ -175,34 +324,36 @@ class ExcelFileReader:
             Diccionario {nombre_hoja: DataFrame}
         """
         try:
-            engine = 'openpyxl' if ruta_excel.suffix == '.xlsx' else 'xlrd'
             processed_sheets = {}
 
-            with pd.ExcelFile(ruta_excel, engine=engine) as xls:
-                hojas_a_leer = hojas if hojas is not None else xls.sheet_names
+            xls = self._abrir_excel(ruta_excel)
+            hojas_a_leer = hojas if hojas is not None else xls.sheet_names
 
-                for sheet_name in hojas_a_leer:
-                    sheet_name_str = str(sheet_name)
+            for sheet_name in hojas_a_leer:
+                sheet_name_str = str(sheet_name)
 
-                    try:
-                        df = pd.read_excel(
-                            xls,
-                            sheet_name=sheet_name,
-                            dtype=str,
-                            header=None
-                        )
-
-                        df = self._encontrar_y_ajustar_header(df)
-                        
-                        if not df.empty:
-                            df.columns = [self._limpiar_header(col) for col in df.columns]
-                            df = df.dropna(how='all')
-                            processed_sheets[sheet_name_str] = df
-                    
-                    except Exception as ex:
-                        logger.error(f"Error leyendo hoja {sheet_name_str}: {ex}")
-
-                return processed_sheets
+                try:
+                    df = pd.read_excel(
+                        xls,
+                        sheet_name=sheet_name,
+                        dtype=str,
+                        header=None
+                    )
+
+                    df = self._encontrar_y_ajustar_header(df)
+
+                    if not df.empty:
+                        df.columns = self._limpiar_headers(df.columns)
+                        # Cubre tanto NaN (na_filter de pandas) como '' en una
+                        # sola pasada vectorizada, sin el doble escaneo de dropna.
+                        vals = df.to_numpy()
+                        df = df.loc[(~pd.isna(vals) & (vals != '')).any(axis=1)]
+                        processed_sheets[sheet_name_str] = df
+
+                except Exception as ex:
+                    logger.error(f"Error leyendo hoja {sheet_name_str}: {ex}")
+
+            return processed_sheets
 
         except Exception as e:
             logger.error(f"Error leyendo múltiples hojas: {e}", exc_info=True)
@@ -217,42 +368,89 @@ class ExcelFileReader:
         total_filas = len(df)
         limit = min(25, total_filas)
         metadata_content = {}
-        
-        for i in range(limit):
-            row_values_raw = df.iloc[i].values
-            row_values_upper = [str(x).upper().strip() for x in row_values_raw]
 
-            for idx_col, val in enumerate(row_values_raw):
-                val_str = str(val).strip()
-                if ':' in val_str and len(val_str) < 50:
+        # Un único bloque ndarray de las filas candidatas, compartido entre la
+        # detección de encabezados y el escaneo de metadatos (antes cada fase
+        # materializaba el suyo).
+        arr = df.iloc[:limit].to_numpy(dtype=object, copy=False)
+
+        # Localiza la fila de encabezados con una sola pasada vectorizada en
+        # vez de indexar df.iloc fila por fila (que crea un ndarray por fila).
+        head = df.iloc[:limit].astype(str).apply(lambda c: c.str.strip().str.upper())
+        mask = head.isin(self.KEYWORDS_HEADER_SET).to_numpy().any(axis=1)
+
+        if mask.any():
+            fila_header = int(mask.argmax())
+        else:
+            fila_header = None
+
+        # La extracción de metadatos ('CLAVE: valor') necesita mirar celdas
+        # adyacentes; se mantiene el bucle pero acotado a las filas previas al
+        # encabezado y sobre un único ndarray ya materializado.
+        filas_a_revisar = limit if fila_header is None else fila_header + 1
+        for fila in arr[:filas_a_revisar]:
+            fila_str = [str(v) for v in fila]
+            # La mayoría de filas no trae metadatos: un chequeo barato por
+            # fila evita el strip/replace celda a celda cuando no hay ':'.
+            if not any(':' in s for s in fila_str):
+                continue
+
+            n_cols = len(fila_str)
+            for idx_col, val in enumerate(fila_str):
+                if ':' not in val:
+                    continue
+                val_str = val.strip()
+                if len(val_str) < 50:
                     key = val_str.replace(':', '').strip().upper()
 
-                    if idx_col + 1 < len(row_values_raw):
-                        next_val = str(row_values_raw[idx_col + 1]).strip()
+                    if idx_col + 1 < n_cols:
+                        next_val = fila_str[idx_col + 1].strip()
                         if next_val and next_val.lower() != 'nan':
                             metadata_content[key] = next_val
 
-            match = any(keyword in row_values_upper for keyword in self.KEYWORDS_HEADER)
-            if match:
-                if i > 0:
-                    logger.info(f"🔎 Encabezados detectados en fila {i+1}. Ajustando tabla...")
-                    nuevos_headers = df.iloc[i]
-                    header_rows = df.iloc[:i].copy()
-                    df_nuevo = df.iloc[i+1:].reset_index(drop=True)
-                    df_nuevo.columns = nuevos_headers
-                    df_nuevo.attrs['metadata'] = metadata_content
-                    df_nuevo.attrs['header_rows'] = header_rows
-
-                    return df_nuevo
-                else:
-                    df.columns = df.iloc[i]
-                    df_final = df.iloc[i+1:].reset_index(drop=True)
-                    df_final.attrs['metadata'] = metadata_content
-                    df_final.attrs['header_rows'] = pd.DataFrame()
-                    return df_final
+        if fila_header is not None:
+            i = fila_header
+            if i > 0:
+                logger.info(f"🔎 Encabezados detectados en fila {i+1}. Ajustando tabla...")
+                nuevos_headers = df.iloc[i]
+                # Filas previas al encabezado como tupla de tuplas: attrs solo
+                # admite valores comparables con ==; un DataFrame ahí rompe el
+                # __finalize__ de pandas 3 (astype, concat) con 'truth value
+                # of a DataFrame is ambiguous'.
+                header_rows = tuple(map(tuple, arr[:i]))
+                df_nuevo = df.iloc[i+1:].reset_index(drop=True)
+                df_nuevo.columns = nuevos_headers
+                df_nuevo.attrs['metadata'] = metadata_content
+                df_nuevo.attrs['header_rows'] = header_rows
+                # Índice crudo (base 0) de la fila de encabezados: evita que
+                # pasos posteriores re-escaneen la hoja buscándola de nuevo.
+                df_nuevo.attrs['header_row_idx'] = i
+
+                return df_nuevo
+            else:
+                df.columns = df.iloc[i]
+                df_final = df.iloc[i+1:].reset_index(drop=True)
+                df_final.attrs['metadata'] = metadata_content
+                df_final.attrs['header_rows'] = ()
+                df_final.attrs['header_row_idx'] = i
+                return df_final
 
         return df
 
+    @staticmethod
+    def _limpiar_headers(columns) -> pd.Index:
+        """
+        Versión vectorizada de _limpiar_header para todo el set de columnas:
+        una pasada de Series.str en vez de una llamada Python por columna.
+        """
+        return (
+            pd.Index(columns)
+            .astype(str)
+            .str.strip()
+            .str.upper()
+            .str.replace(_HEADER_WS_RE, ' ', regex=True)
+        )
+
     def _limpiar_header(self, header: str) -> str:
         """
         Limpia y normaliza un header de columna.
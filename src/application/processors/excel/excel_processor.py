@@ -1,5 +1,8 @@
 from __future__ import annotations
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
+import io
 import logging
 import os
 import shutil
@@ -20,6 +23,27 @@ from src.presentation.api.external_api_client import ExternalApiClient
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=256)
+def _es_hoja_parametros(nombre_hoja: str) -> bool:
+    """
+    Predicado memoizado: el mismo nombre de hoja se consulta varias veces por
+    archivo (detección inicial + cada copia filtrada) y entre archivos del
+    mismo cliente los nombres se repiten.
+    """
+    return "PARAMETRO" in nombre_hoja.upper()
+
+
+@lru_cache(maxsize=4096)
+def _normalizar_codigo_punto(raw: str) -> str:
+    """
+    Parte numérica del código de punto, memoizada: las hojas de solicitudes
+    repiten un set pequeño de puntos, así que N filas se convierten en K
+    construcciones únicas de CodigoPunto.
+    """
+    return CodigoPunto.from_raw(raw).parte_numerica.strip()
+
+
 class ExcelProcessor:
     """
     Procesador principal de archivos Excel de solicitudes.
@@ -60,7 +84,7 @@ class ExcelProcessor:
             cliente_name = cliente_folder.folder_name
             self._path_manager.create_request_structure(cliente_name)
 
-            logger.info(f"== Procesando: {ruta_excel.name} para Cliente: {cliente_name} ==")
+            logger.info("== Procesando: %s para Cliente: %s ==", ruta_excel.name, cliente_name)
 
             if self._api_service:
                 log_payload = {
@@ -80,6 +104,10 @@ class ExcelProcessor:
                     logger.error(f"Error al registrar evento de inicio: {e}")
         
             info = self._reader.read_multiple_sheets(ruta_excel)
+            # Libera el handle cacheado de ESTE archivo: más adelante se
+            # mueve/elimina y en Windows un handle abierto lo bloquearía.
+            # Solo el propio: el lector se comparte entre los workers del pool.
+            self._reader.close(ruta_excel)
             if not info:
                 self._actualizar_log_fallido(log_id, str(e), ruta_excel)
                 self._manejar_excel_fallido(ruta_excel, cliente_name, "Archivo vacío o ilegible")
@@ -92,24 +120,34 @@ class ExcelProcessor:
                 self._manejar_excel_fallido(ruta_excel, cliente_name, str(e))
                 return False
 
-            nombre_hoja_params = next((k for k in info.keys() if "PARAMETRO" in k.upper()), None)
+            nombre_hoja_params = next((k for k in info if _es_hoja_parametros(k)), None)
             if nombre_hoja_params and hasattr(mapper, 'actualizar_parametros'):
                 mapper.actualizar_parametros(info.pop(nombre_hoja_params))
 
+            # El lector ya localizó la fila de encabezados de cada hoja; se
+            # conserva para que las copias filtradas no vuelvan a escanearla.
+            header_idx_por_hoja = {
+                nombre_hoja: df.attrs.get('header_row_idx')
+                for nombre_hoja, df in info.items()
+            }
+
             dtos_a_enviar = []
             mapeo_filas_origen = {}
-            
+            # .name dispara un split del path en cada acceso del property
+            nombre_excel = ruta_excel.name
+
             for nombre_hoja, df in info.items():
                 valido, error_msg = mapper.validar_estructura(df)
                 if not valido:
                     logger.warning(f"Saltando hoja '{nombre_hoja}' - {error_msg}")
                     continue
 
-                datos_hoja = mapper.mapear_a_dtos(df, f"{ruta_excel.name} [{nombre_hoja}]")
+                nombre_archivo = f"{nombre_excel} [{nombre_hoja}]"
+                datos_hoja = mapper.mapear_a_dtos(df, nombre_archivo)
             
                 for dto, idx_fila in datos_hoja:
                     punto = dto.cod_punto_origen if dto.cod_punto_origen != "FONDO" else dto.cod_punto_destino
-                    punto_limpio = CodigoPunto.from_raw(str(punto)).parte_numerica.strip() 
+                    punto_limpio = _normalizar_codigo_punto(str(punto))
 
                     dto.cod_punto_origen = punto_limpio
                     dto.cod_punto_destino = ""
@@ -124,7 +162,7 @@ class ExcelProcessor:
                 return False
 
             cantidad_registros = len(dtos_a_enviar)
-            payload_str = json.dumps([dto.__dict__ for dto in dtos_a_enviar], default=str)
+            payload_str = json.dumps([dto.to_dict() for dto in dtos_a_enviar], default=str)
             logger.info(f"🚀 Enviando {cantidad_registros} servicios a VCashApp vía API...")
             respuesta = self._api_service.upload_services(dtos_a_enviar)
 
@@ -157,7 +195,7 @@ class ExcelProcessor:
                     except Exception as e:
                         logger.error(f"Error al enviar servicios a la API Externa: {e}")
 
-                return self._gestionar_finalizacion(ruta_excel, cliente_name, respuesta, mapeo_filas_origen)
+                return self._gestionar_finalizacion(ruta_excel, cliente_name, respuesta, mapeo_filas_origen, header_idx_por_hoja)
             else:
                 self._actualizar_log_fallido(log_id, "Error al enviar servicios a VCashApp", ruta_excel)
                 self._manejar_excel_fallido(ruta_excel, cliente_name, "Error al enviar servicios a VCashApp")
@@ -169,22 +207,20 @@ class ExcelProcessor:
             self._manejar_excel_fallido(ruta_excel, cliente_name, str(e))
             return False
 
-    def _gestionar_finalizacion(self, ruta_excel: Path, cliente_name: str, respuesta: dict, mapeo: dict) -> bool:
+    def _gestionar_finalizacion(self, ruta_excel: Path, cliente_name: str, respuesta: dict, mapeo: dict, header_idx_por_hoja: dict | None = None) -> bool:
         """
         Gestiona la finalización del procesamiento del archivo Excel.
         """
-        exitosos_indices = {}
-        fallidos_indices = {}
+        exitosos_indices = defaultdict(set)
+        fallidos_indices = defaultdict(set)
         errores_log = []
-        
+
         for idx, result in enumerate(respuesta.get('details', [])):
             hoja, fila_idx, pedido = mapeo[idx]
 
             if result['success']:
-                if hoja not in exitosos_indices: exitosos_indices[hoja] = set()
                 exitosos_indices[hoja].add(fila_idx)
             else:
-                if hoja not in fallidos_indices: fallidos_indices[hoja] = set()
                 fallidos_indices[hoja].add(fila_idx)
                 errores_log.append(f"Fila {fila_idx + 6} (Hoja {hoja}): Pedido {pedido} -> {result['message']}")
 
@@ -192,37 +228,58 @@ class ExcelProcessor:
         total_fallidos = sum(len(v) for v in fallidos_indices.values())
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # stem/suffix disparan un splitext nuevo en cada acceso del property
+        sufijo = ruta_excel.suffix
         nombre_base = ruta_excel.stem.replace('_NOVEDADES', '').replace('_OK', '').split('_202')[0]
 
+        # Si hacen falta las dos copias filtradas (exitosos y novedades), el
+        # origen se abre una sola vez y se comparte: abrir el xlsx (zip + XML)
+        # cuesta más que recorrerlo.
+        necesita_copia_ok = total_exitosos > 0 and total_fallidos != 0
+        necesita_copia_nov = total_fallidos > 0
+        wb_origen = None
+        if necesita_copia_ok and necesita_copia_nov:
+            try:
+                wb_origen = openpyxl.load_workbook(ruta_excel, read_only=True, data_only=True)
+            except Exception as e:
+                logger.error(f"Error abriendo origen para copias filtradas: {e}")
+
         if total_exitosos > 0:
             gestionados_dir =  self._path_manager.get_gestionado_path(cliente_name)
             gestionados_dir.mkdir(parents=True, exist_ok=True)
-            ruta_ok = gestionados_dir / f"{nombre_base}_OK_{timestamp}{ruta_excel.suffix}"
+            ruta_ok = gestionados_dir / f"{nombre_base}_OK_{timestamp}{sufijo}"
 
-            if total_fallidos == 1:
-                shutil.move(str(ruta_excel), str(ruta_ok))
+            # Atajo todo-exitoso: si no hubo fallas, la "copia filtrada" sería
+            # idéntica al original; basta mover el archivo (rename O(1)).
+            if total_fallidos == 0:
+                self._mover_archivo(ruta_excel, ruta_ok)
                 logger.info(f"✅ Archivo completo movido a Gestionados")
             else:
-                self._generar_copia_filtrada(ruta_excel, ruta_ok, exitosos_indices)
+                self._generar_copia_filtrada(ruta_excel, ruta_ok, exitosos_indices, wb_src=wb_origen, header_idx_por_hoja=header_idx_por_hoja)
                 logger.info(f"📁 Copia de exitosos guardada en GESTIONADOS")
 
         if total_fallidos > 0:
             novedades_dir = self._path_manager.get_novedades_path(cliente_name)
             novedades_dir.mkdir(parents=True, exist_ok=True)
-            ruta_novedades = novedades_dir / f"{nombre_base}_NOVEDADES_{timestamp}{ruta_excel.suffix}"
-            self._generar_copia_filtrada(ruta_excel, ruta_novedades, fallidos_indices, borrar_hojas_vacias=True)
-            
+            ruta_novedades = novedades_dir / f"{nombre_base}_NOVEDADES_{timestamp}{sufijo}"
+            self._generar_copia_filtrada(ruta_excel, ruta_novedades, fallidos_indices, borrar_hojas_vacias=True, wb_src=wb_origen, header_idx_por_hoja=header_idx_por_hoja)
+
             ruta_txt = novedades_dir / f"{nombre_base}_NOVEDADES_{timestamp}.txt"
-            with open(ruta_txt, 'w', encoding='utf-8') as f:
-                f.write(f"REPORTE DE NOVEDADES - AETHERCORE 4\n")
-                f.write(f"Archivo: {ruta_excel.name}\n")
-                f.write(f"Resultado API: {respuesta.get('summary')}\n")
-                f.write("-" * 60 + "\n")
-                for err in errores_log:
-                    f.write(f"- {err}\n")
-            
+            # Una sola escritura: el reporte se arma en memoria en vez de un
+            # write (y su paso por la capa de IO) por línea de error.
+            lineas = [
+                "REPORTE DE NOVEDADES - AETHERCORE 4\n",
+                f"Archivo: {ruta_excel.name}\n",
+                f"Resultado API: {respuesta.get('summary')}\n",
+                "-" * 60 + "\n",
+            ]
+            lineas.extend(f"- {err}\n" for err in errores_log)
+            ruta_txt.write_text("".join(lineas), encoding='utf-8')
+
             logger.warning(f"⚠️ Se generó archivo de NOVEDADES con {total_fallidos} errores")
 
+        if wb_origen is not None:
+            wb_origen.close()
 
         if ruta_excel.exists():
             try:
@@ -230,69 +287,113 @@ class ExcelProcessor:
             except Exception as e:
                 logger.error(f"❌ Error al eliminar archivo original: {e}")  
 
-        logger.info(f"=== PROCESO FINALIZADO: {total_exitosos} OK / {total_fallidos} ERROR ===")
+        logger.info("=== PROCESO FINALIZADO: %s OK / %s ERROR ===", total_exitosos, total_fallidos)
         return True          
 
-    def _generar_copia_filtrada(self, ruta_origen: Path, ruta_destino: Path, filas_a_mantener: dict, borrar_hojas_vacias: bool = True):
+    def _generar_copia_filtrada(self, ruta_origen: Path, ruta_destino: Path, filas_a_mantener: dict, borrar_hojas_vacias: bool = True, wb_src=None, header_idx_por_hoja: dict | None = None):
         """
         Genera una copia del archivo Excel filtrando solo las filas especificadas.
+
+        El origen se recorre en modo read_only (streaming) y el destino se
+        construye en modo write_only: nunca se materializa el libro completo
+        en memoria ni se copia el archivo byte a byte para después editarlo
+        celda a celda. Si el llamador ya tiene el libro origen abierto puede
+        pasarlo en wb_src para no re-parsear el zip (abrir un xlsx cuesta
+        más que iterarlo).
         """
         try:
-            shutil.copy2(ruta_origen, ruta_destino)
-            wb = openpyxl.load_workbook(ruta_destino)
-            KEYWORDS = ExcelFileReader.KEYWORDS_HEADER
-
-            hojas_a_borrar = []
-            
-            for sheet_name in wb.sheetnames:
-                if "PARAMETRO" in sheet_name.upper():
-                    continue
+            handle_propio = wb_src is None
+            if handle_propio:
+                wb_src = openpyxl.load_workbook(ruta_origen, read_only=True, data_only=True)
+            wb_dst = openpyxl.Workbook(write_only=True)
+            try:
+                hojas_escritas = 0
+                for sheet_name in wb_src.sheetnames:
+                    es_params = _es_hoja_parametros(sheet_name)
+                    indices_a_mantener = filas_a_mantener.get(sheet_name, set())
+
+                    if (not indices_a_mantener and not es_params
+                            and borrar_hojas_vacias and len(wb_src.sheetnames) > 1):
+                        continue
+
+                    # Índice de encabezado ya detectado por el lector (base 0
+                    # crudo -> base 1 de openpyxl); None obliga a re-escanear.
+                    hdr = None
+                    if header_idx_por_hoja is not None:
+                        hdr = header_idx_por_hoja.get(sheet_name)
+
+                    ws_dst = wb_dst.create_sheet(sheet_name)
+                    self._copiar_hoja_filtrada(
+                        wb_src[sheet_name],
+                        ws_dst,
+                        indices_a_mantener,
+                        copiar_todo=es_params,
+                        header_row_idx=None if hdr is None else hdr + 1
+                    )
+                    hojas_escritas += 1
+
+                if hojas_escritas == 0:
+                    # write_only no permite guardar un libro sin hojas
+                    wb_dst.create_sheet(wb_src.sheetnames[0])
+
+                # Serializa a memoria y vuelca de un golpe vía temporal +
+                # os.replace: una sola escritura grande en lugar de las muchas
+                # pequeñas del zipfile, y sin archivos a medias si algo falla
+                # (importante cuando el destino vive en un share de red).
+                buf = io.BytesIO()
+                wb_dst.save(buf)
+                tmp = ruta_destino.with_suffix(ruta_destino.suffix + '.tmp')
+                tmp.write_bytes(buf.getbuffer())
+                os.replace(tmp, ruta_destino)
+            finally:
+                if handle_propio:
+                    wb_src.close()
 
-                indices_a_mantener = filas_a_mantener.get(sheet_name, set())
-                ws = wb[sheet_name]
-                
-                if not indices_a_mantener:
-                    if borrar_hojas_vacias and len(wb.sheetnames) > 1:
-                        hojas_a_borrar.append(sheet_name)
-                    else:
-                        self._limpiar_datos_hoja(ws, KEYWORDS, set())
-                    continue
-                    
-                self._limpiar_datos_hoja(ws, KEYWORDS, indices_a_mantener)
-            
-            for sh_name in hojas_a_borrar:
-                if len(wb.sheetnames) > 1:
-                    del wb[sh_name]
-            
-            wb.save(ruta_destino)
-            wb.close()
-            
         except Exception as e:
             logger.error(f"Error generando copia filtrada {ruta_destino.name}: {e}")
 
-    def _limpiar_datos_hoja(self, ws, keywords: list, indices_a_mantener: set):
+    def _copiar_hoja_filtrada(self, ws_src, ws_dst, indices_a_mantener: set, copiar_todo: bool = False, header_row_idx: int | None = None):
         """
-        Limpia los datos de una hoja, manteniendo solo las filas especificadas.
+        Copia una hoja al libro write_only en una sola pasada: las filas
+        previas al encabezado van siempre; de las filas de datos, solo las
+        indicadas. Si no se detecta encabezado (o copiar_todo), pasa todo.
+        Cuando el lector ya detectó el encabezado, header_row_idx (base 1)
+        evita re-escanear las primeras filas buscando las palabras clave.
         """
-        header_row_idx = None
-        for i, row in enumerate(ws.iter_rows(max_row=15, values_only=True), start=1):
-            row_str = [str(c).upper().strip() if c else "" for c in row]
-            if any(k in row_str for k in keywords):
-                header_row_idx = i
-                break
-        
-        if not header_row_idx: return
-
-        start_data_row = header_row_idx + 1
-        max_row = ws.max_row
-        filas_a_mantener = {start_data_row + idx for idx in indices_a_mantener}
-
-        for r in range(start_data_row, max_row + 1):
-            if r not in filas_a_mantener:
-                for cell in ws[r]:
-                    cell.value = None
-
-                ws.row_dimensions[r].hidden = True
+        keywords = ExcelFileReader.KEYWORDS_HEADER_SET
+        escanear = not copiar_todo and header_row_idx is None
+
+        for i, row in enumerate(ws_src.iter_rows(values_only=True), start=1):
+            if copiar_todo or header_row_idx is None:
+                if escanear and i <= 15:
+                    # Generador con corte en el primer acierto: no se
+                    # materializa la lista de la fila ni se normalizan las
+                    # celdas que vienen después del match.
+                    if any(c and str(c).upper().strip() in keywords for c in row):
+                        header_row_idx = i
+                ws_dst.append(row)
+                continue
+
+            # Filas hasta el encabezado (incluido) van siempre
+            if i <= header_row_idx:
+                ws_dst.append(row)
+                continue
+
+            # Fila de datos: el índice del DataFrame es relativo al encabezado
+            if (i - header_row_idx - 1) in indices_a_mantener:
+                ws_dst.append(row)
+
+    @staticmethod
+    def _mover_archivo(origen: Path, destino: Path):
+        """
+        Mueve con os.replace: rename de inodo, O(1) en el mismo filesystem
+        (el caso normal, SOLICITUDES y GESTIONADOS cuelgan del mismo base_dir).
+        Si el destino está en otro dispositivo (EXDEV), cae a shutil.move.
+        """
+        try:
+            os.replace(str(origen), str(destino))
+        except OSError:
+            shutil.move(str(origen), str(destino))
 
     def _manejar_excel_fallido(self, ruta_excel: Path, cliente_name: str, razon_error: str):
         """
@@ -303,16 +404,16 @@ class ExcelProcessor:
             errores_dir = self._path_manager.get_errores_path(cliente_name)
             errores_dir.mkdir(exist_ok=True)
 
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            ahora = datetime.now()
+            timestamp = ahora.strftime('%Y%m%d_%H%M%S')
             nombre = f"{ruta_excel.stem}_ERROR_{timestamp}{ruta_excel.suffix}"
             destino = errores_dir / nombre
 
-            os.rename(ruta_excel, destino)
+            self._mover_archivo(ruta_excel, destino)
 
             log_path = destino.with_suffix('.txt')
-            with open(log_path, 'w', encoding='utf-8') as f:
-                f.write(f"Error: {razon_error}\nFecha: {datetime.now()}")
-            
+            log_path.write_text(f"Error: {razon_error}\nFecha: {ahora}", encoding='utf-8')
+
             logger.info(f"Log de error creado: {destino.name}")
         except Exception as e:
             logger.error(f"Error moviendo archivo fallido: {e}")
@@ -345,13 +446,13 @@ class ExcelProcessor:
             raw_value = dto.valor_total_declarado
             if not raw_value:
                 raw_value = dto.valor_billete + dto.valor_moneda
-            logger.info(f"🔍 DEBUG MONTO - Valor crudo: '{raw_value}' | Tipo: {type(raw_value)}")
+            logger.debug("🔍 DEBUG MONTO - Valor crudo: %r | Tipo: %s", raw_value, type(raw_value))
 
             try:
                 clean_value = str(raw_value).replace('$', '').replace(',', '').replace(' ', '').strip()
                 total_service = str(int(float(clean_value)))
             except (ValueError, TypeError):
-                logger.error(f"❌ ERROR CONVERSION - No se pudo convertir '{raw_value}' a entero")
+                logger.error("❌ ERROR CONVERSION - No se pudo convertir %r a entero", raw_value)
                 total_service = "0"
 
             service = {
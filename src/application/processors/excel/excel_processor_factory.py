@@ -10,14 +10,14 @@ class ExcelProcessorFactory:
     Se mantiene el patrón Factory por si en el futuro lejano 
     necesitas una excepción, pero por ahora es directo.
     """
+    # Tabla cod_cliente -> clase de mapper: un lookup de dict en lugar de
+    # una cadena de comparaciones por lista.
+    _MAPPERS = {
+        '4': EmergencyMapper,
+        '58': Cash4uExcelMapper,
+    }
+
     @staticmethod
     def get_mapper(cod_cliente: int | str) -> BaseExcelMapper:
         cod = str(cod_cliente)
-
-        if cod in ['4']:
-            return EmergencyMapper(cod)
-
-        if cod in ['58']:
-            return Cash4uExcelMapper(cod)
-
-        return StandardExcelMapper(cod)
\ No newline at end of file
+        return ExcelProcessorFactory._MAPPERS.get(cod, StandardExcelMapper)(cod)
\ No newline at end of file
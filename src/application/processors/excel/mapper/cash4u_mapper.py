@@ -2,6 +2,9 @@ from __future__ import annotations
 from typing import List, Tuple
 from datetime import datetime, date
 from decimal import Decimal
+from functools import lru_cache
+import re
+import numpy as np
 import pandas as pd
 import logging
 
@@ -10,6 +13,63 @@ from src.application.dto.servicio_dto import AetherServiceImportDto
 
 logger = logging.getLogger(__name__)
 
+# Decimal cero compartido para los bucles por fila (Decimal es inmutable).
+_ZERO = Decimal('0')
+
+# Tablas de traducción precomputadas: una sola pasada en C por cadena en
+# lugar de varios str.replace encadenados.
+_TABLA_LIMPIEZA = str.maketrans('', '', '_.')
+_TABLA_MONETARIO = str.maketrans({'_': None, '$': None, ' ': None, '.': None, ',': '.'})
+_TABLA_ENTERO = str.maketrans({'_': None, ' ': None, '.': None})
+
+
+@lru_cache(maxsize=128)
+def _resolver_columnas_cash4u(cols_upper: tuple) -> tuple:
+    """
+    Resolución pura de columnas Cash4U, memoizada por tupla de columnas:
+    los libros multi-hoja con la misma estructura resuelven una sola vez.
+    """
+    col_pedido = next((c for c in cols_upper if "NRO" in c and "SERVICIO" in c), None)
+    punto_especifico = next((c for c in cols_upper if "PUNTO" in c and ("CODIGO" in c or "CÓDIGO" in c or "COD" in c)), None)
+    codigo_generico = next((c for c in cols_upper if "CODIGO" in c or "CÓDIGO" in c or "COD" in c), None)
+    col_codigo = punto_especifico if punto_especifico else codigo_generico
+    col_calidad = next((c for c in cols_upper if "CALIDAD" in c), None)
+    col_valor_rec = next((c for c in cols_upper if "VALOR" in c and "RECOLECCI" in c), None)
+    return (col_pedido, col_codigo, col_calidad, col_valor_rec)
+
+
+@lru_cache(maxsize=128)
+def _indices_columnas_cash4u(cols_upper: tuple) -> tuple:
+    """
+    Índices posicionales (pedido, codigo, calidad, valor_rec) para una tupla
+    de columnas; -1 si la columna no existe. Memoizado junto a la resolución
+    de nombres: los libros multi-hoja con el mismo esquema no reconstruyen
+    el mapa columna->índice por hoja.
+    """
+    mapa = {c: i for i, c in enumerate(cols_upper)}
+    return tuple(mapa.get(nombre, -1) for nombre in _resolver_columnas_cash4u(cols_upper))
+
+
+@lru_cache(maxsize=128)
+def _cols_denominacion_cash4u(cols: tuple) -> tuple:
+    """
+    Columnas de denominación ((índice, valor), ...) ordenadas de mayor a
+    menor, memoizadas por tupla de encabezados.
+    """
+    cols_denominacion = []
+    for col, col_name in enumerate(cols):
+        raw_col = str(col_name).replace('$', '').strip()
+
+        try:
+            clean_col = raw_col.replace('.0', '').replace('.', '').replace(',', '')
+            if clean_col.isdigit() and int(clean_col) >= 50:
+                cols_denominacion.append((col, int(clean_col)))
+        except: continue
+
+    cols_denominacion.sort(key=lambda x: x[1], reverse=True)
+    return tuple(cols_denominacion)
+
+
 class Cash4uExcelMapper(BaseExcelMapper):
     """
     Mapper especializado para formato (Cash4U).
@@ -17,8 +77,15 @@ class Cash4uExcelMapper(BaseExcelMapper):
 
     DEFAULT_USER_ID = "dda6d2ea-0a02-4f77-a063-04d940572a1a"
 
+    # Palabras que marcan el inicio de la zona de resumen al pie del bloque.
+    # Precompilado una sola vez: un único escaneo regex por columna en lugar
+    # de un contains por palabra clave.
+    _BASURA_RE = re.compile(r'RESUMEN|DENOMINACION', re.IGNORECASE)
+
     def __init__(self, cod_cliente: str):
         self._cod_cliente = cod_cliente
+        # Conversión única: int(cod_cliente) se repetía por cada DTO
+        self._cod_cliente_int = int(cod_cliente)
         self.col_pedido = None
         self.col_codigo = None
         self.col_calidad = None
@@ -33,15 +100,13 @@ class Cash4uExcelMapper(BaseExcelMapper):
         return "CASH4U_CLIENTE"
 
     def validar_estructura(self, df: pd.DataFrame) -> tuple[bool, str]:
-        cols_upper = [str(c).upper().strip() for c in df.columns]
-
-        self.col_pedido = next((c for c in cols_upper if "NRO" in c and "SERVICIO" in c), None)
-        punto_especifico = next((c for c in cols_upper if "PUNTO" in c and ("CODIGO" in c or "CÓDIGO" in c or "COD" in c)), None)
-        codigo_generico = next((c for c in cols_upper if "CODIGO" in c or "CÓDIGO" in c or "COD" in c), None)
-        self.col_codigo = punto_especifico if punto_especifico else codigo_generico
-        self.col_calidad = next((c for c in cols_upper if "CALIDAD" in c), None)
-        self.col_valor_rec = next((c for c in cols_upper if "VALOR" in c and "RECOLECCI" in c), None)
-        
+        cols_upper = tuple(str(c).upper().strip() for c in df.columns)
+
+        (self.col_pedido,
+         self.col_codigo,
+         self.col_calidad,
+         self.col_valor_rec) = _resolver_columnas_cash4u(cols_upper)
+
         if not self.col_pedido or not self.col_codigo:
             return False, "Columnas requeridas no encontradas"
         
@@ -56,75 +121,110 @@ class Cash4uExcelMapper(BaseExcelMapper):
         raw_f_solicitud = metadata.get('FECHA SOLICITUD') or metadata.get('FECHA DE SOLICITUD')
         fecha_sol = self._parsear_fecha(raw_f_solicitud) or date.today()
 
-        cols_denominacion = []
-        for col, col_name in enumerate(df.columns):
-            raw_col = str(col_name).replace('$', '').strip()
-
-            try:
-                clean_col = raw_col.replace('.0', '').replace('.', '').replace(',', '')
-                if clean_col.isdigit() and int(clean_col) >= 50:
-                    cols_denominacion.append((col, int(clean_col)))
-            except: continue
-
-        cols_denominacion.sort(key=lambda x: x[1], reverse=True)
-
-        map_cols = {str(c).upper().strip(): i for i, c in enumerate(df.columns)}
-        idx_pedido = map_cols.get(self.col_pedido, -1)
-        idx_codigo = map_cols.get(self.col_codigo, -1)
-        idx_calidad = map_cols.get(self.col_calidad, -1)
-        idx_valor_rec = map_cols.get(self.col_valor_rec, -1)
-        
-        for idx, row in df.iterrows():
+        cols_denominacion = _cols_denominacion_cash4u(tuple(df.columns))
+
+        cols_upper = tuple(str(c).upper().strip() for c in df.columns)
+        idx_pedido, idx_codigo, idx_calidad, idx_valor_rec = _indices_columnas_cash4u(cols_upper)
+
+        if df.empty or idx_pedido == -1 or idx_codigo == -1:
+            return dtos
+
+        # Columnas preparadas de una sola pasada vectorizada (Series.str en C)
+        # en lugar de str()/strip()/replace por celda dentro de iterrows.
+        # fillna('') antes de astype(str): en pandas 3 astype(str) conserva
+        # NaN y las celdas vacías pasarían los guards != '' / != '0'.
+        pedido_s = df.iloc[:, idx_pedido].fillna('').astype(str).str.strip()
+
+        # La zona de resumen al pie termina los datos: se recorta el bloque
+        # hasta la primera fila RESUMEN/DENOMINACION (el break original).
+        stop_mask = pedido_s.str.contains(self._BASURA_RE)
+        if stop_mask.any():
+            corte = int(stop_mask.to_numpy().argmax())
+            df = df.iloc[:corte]
+            pedido_s = pedido_s.iloc[:corte]
+
+        cod_s = df.iloc[:, idx_codigo].fillna('').astype(str).str.strip()
+        pedido_clean_s = pedido_s.str.translate(_TABLA_LIMPIEZA).str.strip()
+        punto_clean_s = cod_s.str.translate(_TABLA_LIMPIEZA).str.strip()
+        if idx_calidad != -1:
+            calidad_s = df.iloc[:, idx_calidad].fillna('').astype(str).str.upper().str.strip()
+        else:
+            calidad_s = pd.Series("", index=df.index, dtype=object)
+
+        # El bloque de denominaciones se parsea completo de una pasada
+        # vectorizada (misma limpieza que _parse_entero, pero en C) en lugar
+        # de un _parse_entero por celda dentro del bucle de filas.
+        cantidades = np.zeros((len(df), len(cols_denominacion)), dtype=np.int64)
+        for j, (col_idx, _) in enumerate(cols_denominacion):
+            s = (df.iloc[:, col_idx].astype(str)
+                 .str.replace('_', '', regex=False)
+                 .str.replace(' ', '', regex=False)
+                 .str.strip()
+                 .str.replace('.', '', regex=False)
+                 .str.split(',').str[0])
+            cantidades[:, j] = pd.to_numeric(s, errors='coerce').fillna(0).astype(np.int64).to_numpy()
+
+        # Una sola lectura de reloj por lote: todas las filas comparten la
+        # hora de solicitud, no hace falta un syscall + strftime por DTO.
+        hora_solicitud = datetime.now().strftime("%H:%M:%S")
+
+        # Máscara de filas útiles: pedido y punto no vacíos, punto distinto de '0'
+        mask = ((pedido_clean_s != '') & (punto_clean_s != '') & (punto_clean_s != '0')).to_numpy()
+        valores = df.to_numpy(dtype=object)
+        indices = df.index.to_numpy()
+
+        for pos in np.flatnonzero(mask):
+            idx = indices[pos]
             try:
-                val_pedido = str(row.iloc[idx_pedido]).strip() if idx_pedido != -1 else ''
-
-                if "RESUMEN" in val_pedido.upper() or "DENOMINACION" in val_pedido.upper(): break
-                
-                pedido_clean = val_pedido.replace('_', '').replace('.', '').strip()
-                cod_punto = str(row.iloc[idx_codigo]).strip() if idx_codigo != -1 else ''
-                punto_clean = cod_punto.replace('_', '').replace('.', '').strip()
-
-                if not pedido_clean or not punto_clean or punto_clean == '0':
-                    continue
-                
-                calidad = str(row.iloc[idx_calidad]).upper().strip() if idx_calidad != -1 else ""
+                fila = valores[pos]
+                val_pedido = pedido_s.iat[pos]
+                pedido_clean = pedido_clean_s.iat[pos]
+                punto_clean = punto_clean_s.iat[pos]
+                calidad = calidad_s.iat[pos]
+
                 es_recoleccion = (idx_valor_rec != -1 or "RECOLECCION" in calidad)
                 es_atm = "CAJERO" in calidad or "ATM" in calidad
                 es_moneda = "MONEDA" in calidad
 
-                valor_billete = Decimal(0)
-                valor_moneda = Decimal(0)
+                valor_billete = _ZERO
+                valor_moneda = _ZERO
                 detalle_tecnico = []
 
                 if es_recoleccion:
-                    val_rec = row.iloc[idx_valor_rec] if idx_valor_rec != -1 else 0
+                    val_rec = fila[idx_valor_rec] if idx_valor_rec != -1 else 0
                     valor_billete = self._parse_valor_monetario(val_rec)
                 else:
-                    for col_idx, deno_val in cols_denominacion:
-                        cantidad = self._parse_entero(row.iloc[col_idx])
+                    # Denominaciones y cantidades son enteros exactos: se
+                    # acumula con int (aritmética en C) y se convierte a
+                    # Decimal una sola vez al final, no por subtotal.
+                    billete_i = 0
+                    moneda_i = 0
+                    for j, (col_idx, deno_val) in enumerate(cols_denominacion):
+                        cantidad = int(cantidades[pos, j])
                         if cantidad > 0:
                             deno = deno_val
-                            
+
                             if es_moneda and deno >= 10000:
                                 deno = int(deno / 100)
 
-                            subtotal = Decimal(cantidad) * Decimal(deno)
-                            
                             if deno >= 2000:
-                                valor_billete += subtotal
+                                billete_i += cantidad * deno
                             else:
-                                valor_moneda += subtotal
+                                moneda_i += cantidad * deno
 
                             detalle_tecnico.append(f"{deno}:{cantidad}")
+
+                    valor_billete = Decimal(billete_i)
+                    valor_moneda = Decimal(moneda_i)
                     
                 valor_total = valor_billete + valor_moneda
                 cod_con = 1 if es_recoleccion else (3 if es_atm else 2)
 
                 dto = AetherServiceImportDto(
-                    cod_cliente=int(self.cod_cliente),
+                    cod_cliente=self._cod_cliente_int,
                     cod_sucursal=1, 
                     fecha_solicitud=str(fecha_sol),
-                    hora_solicitud=datetime.now().strftime("%H:%M:%S"),
+                    hora_solicitud=hora_solicitud,
                     cod_concepto=cod_con,
                     cod_punto_origen=punto_clean,
                     cod_punto_destino="",
@@ -142,7 +242,7 @@ class Cash4uExcelMapper(BaseExcelMapper):
                 dtos.append((dto, idx))
 
             except Exception as e:
-                logger.error(f"Error al procesar fila {idx} de Cash4U: {e}")
+                logger.error("Error al procesar fila %s de Cash4U: %s", idx, e)
         
         return dtos
 
@@ -187,35 +287,30 @@ class Cash4uExcelMapper(BaseExcelMapper):
                 return date(anio, mes, dia)
 
         except Exception as e:
-            logger.error(f"Error al parsear fecha: '{texto}' - {e}")
+            logger.error("Error al parsear fecha: %r - %s", texto, e)
 
         return None
 
     def _parse_valor_monetario(self, val) -> Decimal:
         if pd.isna(val):
-            return Decimal('0')
-        s = str(val).replace('_', '').replace('$','').replace(' ','').strip()
+            return _ZERO
+        s = str(val).translate(_TABLA_MONETARIO).strip()
         if not s:
-            return Decimal('0')
-        
-        s = s.replace('.', '')
-        s = s.replace(',', '.')
+            return _ZERO
 
         try:
             return Decimal(s)
         except:
-            return Decimal('0')
+            return _ZERO
 
     def _parse_entero(self, val) -> int:
         if pd.isna(val):
             return 0
 
-        s = str(val).replace('_', '').replace(' ','').strip()
+        s = str(val).translate(_TABLA_ENTERO).strip()
         if not s:
             return 0
-        
-        s = s.replace('.', '')
-        
+
         if ',' in s:
             s = s.split(',')[0]
 
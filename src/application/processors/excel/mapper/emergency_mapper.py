@@ -2,6 +2,8 @@ from __future__ import annotations
 from typing import List, Tuple, Dict, Any
 from datetime import datetime, date, time
 from decimal import Decimal
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 import logging
 
@@ -10,6 +12,45 @@ from src.application.dto.servicio_dto import AetherServiceImportDto
 
 logger = logging.getLogger(__name__)
 
+# Decimal cero compartido para los bucles por fila (Decimal es inmutable).
+_ZERO = Decimal('0')
+
+
+@lru_cache(maxsize=1024)
+def _parse_fecha_str(val_str: str) -> date | None:
+    """
+    Parseo de fecha memoizado (None si ningún formato aplica): dentro de
+    un archivo las fechas se repiten, cada cadena paga strptime una vez.
+    """
+    formatos = [
+        '%Y-%m-%d', # 2026-03-28
+        '%d-%m-%Y', # 28-03-2026
+        '%d/%m/%Y', # 28/03/2026
+        '%Y/%m/%d'  # 2026/03/28
+    ]
+
+    for fmt in formatos:
+        try:
+            return datetime.strptime(val_str, fmt).date()
+        except ValueError:
+            continue
+
+    return None
+
+
+@lru_cache(maxsize=128)
+def _resolver_columnas_emergency(cols: tuple) -> tuple:
+    """
+    Resolución pura de columnas Emergency, memoizada por tupla de columnas.
+    """
+    col_pedido = next((c for c in cols if "ID" in c and "BCT" in c), None)
+    col_codigo = next((c for c in cols if "COD" in c and "UNICO" in c), None)
+    col_kit_moneda = next((c for c in cols if "KITS" in c and "MONEDA" in c), None)
+    col_kit_billete = next((c for c in cols if "KITS" in c and "BILLETE" in c), None)
+    col_fecha = next((c for c in cols if "FECHA" in c), None)
+    return (col_pedido, col_codigo, col_kit_moneda, col_kit_billete, col_fecha)
+
+
 class EmergencyMapper(BaseExcelMapper):
     """
     Mapper para archivos Excel de emergencia.
@@ -17,6 +58,8 @@ class EmergencyMapper(BaseExcelMapper):
 
     def __init__(self, cod_cliente: str):
         self._cod_cliente = cod_cliente
+        # Conversión única: int(cod_cliente) se repetía por cada DTO
+        self._cod_cliente_int = int(cod_cliente)
         self.col_pedido = None
         self.col_codigo = None
         self.col_kit_moneda = None
@@ -37,12 +80,12 @@ class EmergencyMapper(BaseExcelMapper):
     def validar_estructura(self, df: pd.DataFrame) -> tuple[bool, str]:
         df.columns = [str(c).upper().strip() for c in df.columns]
 
-        self.col_pedido = next((c for c in df.columns if "ID" in c and "BCT" in c), None)
-        self.col_codigo = next((c for c in df.columns if "COD" in c and "UNICO" in c), None)
-        self.col_kit_moneda = next((c for c in df.columns if "KITS" in c and "MONEDA" in c), None)
-        self.col_kit_billete = next((c for c in df.columns if "KITS" in c and "BILLETE" in c), None)
-        self.col_fecha = next((c for c in df.columns if "FECHA" in c), None)
-        
+        (self.col_pedido,
+         self.col_codigo,
+         self.col_kit_moneda,
+         self.col_kit_billete,
+         self.col_fecha) = _resolver_columnas_emergency(tuple(df.columns))
+
         if not self.col_pedido or not self.col_codigo:
             return False, "Faltan columnas clave (ID BCT, COD. UNICO)"
         
@@ -52,7 +95,7 @@ class EmergencyMapper(BaseExcelMapper):
         dtos = []
         logger.info(f"Procesando archivo Emergency: {nombre_archivo}")
 
-        headers = getattr(df, 'attrs', {}).get('header_rows', pd.DataFrame())
+        headers = getattr(df, 'attrs', {}).get('header_rows', ())
         info_kit = self._extaer_info_kits(headers)
         
         unidad_moneda = info_kit['moneda']['valor']
@@ -60,37 +103,69 @@ class EmergencyMapper(BaseExcelMapper):
         unidad_billete = info_kit['billete']['valor']
         detalle_billete = info_kit['billete']['detalle']
 
-        for idx, row in df.iterrows():
+        # Una sola lectura de reloj por lote: todas las filas del archivo
+        # comparten fecha/hora de solicitud, no hace falta un syscall por DTO.
+        now = datetime.now()
+        fecha_solicitud = str(now.date())
+        hora_solicitud = now.strftime("%H:%M:%S")
+
+        if df.empty:
+            return dtos
+
+        # Columnas preparadas de una sola pasada vectorizada (Series.str /
+        # pd.to_numeric en C) en lugar de limpiar y parsear celda a celda
+        # dentro del bucle de filas. fillna('') antes de astype(str): en
+        # pandas 3 astype(str) conserva NaN y las celdas vacías pasarían
+        # los filtros != '' en vez de descartarse como en el bucle original.
+        pedido_s = df[self.col_pedido].fillna('').astype(str).str.strip().str.replace('.0', '', regex=False)
+        codigo_s = df[self.col_codigo].fillna('').astype(str).str.strip().str.replace('.0', '', regex=False).str.replace(' ', '', regex=False)
+
+        def _enteros(col):
+            if col is None or col not in df.columns:
+                return np.zeros(len(df), dtype=np.int64)
+            return pd.to_numeric(df[col], errors='coerce').fillna(0).astype(np.int64).to_numpy()
+
+        qty_moneda_arr = _enteros(self.col_kit_moneda)
+        qty_billete_arr = _enteros(self.col_kit_billete)
+
+        fechas_vals = None
+        if self.col_fecha is not None and self.col_fecha in df.columns:
+            fechas_vals = df[self.col_fecha].to_numpy(dtype=object)
+
+        # Máscara de filas útiles: pedido y código no vacíos, pedido != NAN
+        mask = ((pedido_s != '') & (codigo_s != '') & (pedido_s.str.upper() != 'NAN')).to_numpy()
+        pedido_arr = pedido_s.to_numpy(dtype=object)
+        codigo_arr = codigo_s.to_numpy(dtype=object)
+        indices = df.index.to_numpy()
+
+        for pos in np.flatnonzero(mask):
+            idx = indices[pos]
             try:
-                pedido = str(row.get(self.col_pedido, '')).strip().replace('.0', '')
-                codigo = str(row.get(self.col_codigo, '')).strip().replace('.0', '').replace(' ', '')
-
-                if not pedido or not codigo or pedido.upper() == 'NAN':
-                    continue
-                
-                qty_moneda = self._parse_entero(row.get(self.col_kit_moneda, 0))
-                qty_billete = self._parse_entero(row.get(self.col_kit_billete, 0))
-                
+                pedido = pedido_arr[pos]
+                codigo = codigo_arr[pos]
+
+                qty_moneda = int(qty_moneda_arr[pos])
+                qty_billete = int(qty_billete_arr[pos])
+
                 total_moneda = Decimal(qty_moneda) * unidad_moneda
                 total_billete = Decimal(qty_billete) * unidad_billete
                 valor_servicio = total_moneda + total_billete
-                
-                fecha_serv = self._parsear_fecha(row.get(self.col_fecha))
-                now = datetime.now()
+
+                fecha_serv = self._parsear_fecha(fechas_vals[pos] if fechas_vals is not None else None)
 
                 obs = f"Kits Moneda: {qty_moneda} [{detalle_moneda}], Kits Billete: {qty_billete} [{detalle_billete}]"[:450]
 
                 dto = AetherServiceImportDto(
-                    cod_cliente=int(self.cod_cliente),
+                    cod_cliente=self._cod_cliente_int,
                     cod_sucursal=1,
-                    fecha_solicitud=str(now.date()),
-                    hora_solicitud=now.strftime("%H:%M:%S"),
+                    fecha_solicitud=fecha_solicitud,
+                    hora_solicitud=hora_solicitud,
                     fecha_programacion=str(fecha_serv),
                     hora_programacion="00:00:00",
                     cod_concepto=2,
                     cod_punto_origen=codigo, 
                     cod_punto_destino="",
-                    numero_pedido=f"{self.cod_cliente}{pedido}",
+                    numero_pedido=f"{self._cod_cliente}{pedido}",
                     cod_os_cliente=pedido,
                     observaciones=obs,
                     valor_billete=total_billete,
@@ -107,49 +182,54 @@ class EmergencyMapper(BaseExcelMapper):
                 dtos.append((dto, idx))
 
             except Exception as e:
-                logger.error(f"Error procesando fila {idx}: {e}")
+                logger.error("Error procesando fila %s: %s", idx, e)
 
         return dtos
 
-    def _extaer_info_kits(self, raw_df: pd.DataFrame) -> dict:
+    def _extaer_info_kits(self, filas_header: tuple) -> dict:
         """
-        Analiza la cabecera para extraer el contenido y valor de los kits.
+        Analiza la cabecera (tupla de tuplas de celdas, attrs['header_rows']
+        del lector) para extraer el contenido y valor de los kits.
         Retorna: {'moneda': {'valor': X, 'detalle': '...'}, 'billete': ...}
         """
         info = {
-            'moneda': {'valor': Decimal('0'), 'detalle': ''},
-            'billete': {'valor': Decimal('0'), 'detalle': ''}
+            'moneda': {'valor': _ZERO, 'detalle': ''},
+            'billete': {'valor': _ZERO, 'detalle': ''}
         }
 
-        if raw_df.empty:
+        if not len(filas_header):
             return info
 
+        # Una sola conversión a ndarray de objetos: el acceso arr[r, c] evita
+        # indexar celda a celda sobre las tuplas anidadas.
+        arr = np.array(filas_header, dtype=object)
+
         indices = []
 
         start_row_idx = -1
-        for i in range(min(5, len(raw_df))):
-            row_vals = [str(x).upper().strip() for x in raw_df.iloc[i].values]
+        for i in range(min(5, len(arr))):
+            row_vals = [str(x).upper().strip() for x in arr[i]]
             for col_idx, val in enumerate(row_vals):
                 if 'DENOMINACIÓN' in val or "DENOMINACION" in val:
                     indices.append(col_idx)
                     start_row_idx = i
             if indices:
                 break
-        
+
         if start_row_idx == -1:
             return info
 
         for table_idx in indices:
             tipo_kit = 'moneda' if table_idx < 5 else 'billete'
             items = []
-            valor_total = Decimal('0')
-            
-            for r in range(start_row_idx + 1, len(raw_df)):
+            valor_total = _ZERO
+
+            for r in range(start_row_idx + 1, len(arr)):
                 try:
-                    denom = str(raw_df.iloc[r, table_idx]).strip()
-                    cant_raw = raw_df.iloc[r, table_idx + 1]
-                    valor_raw = raw_df.iloc[r, table_idx + 2]
-                    
+                    denom = str(arr[r, table_idx]).strip()
+                    cant_raw = arr[r, table_idx + 1]
+                    valor_raw = arr[r, table_idx + 2]
+
                     if not denom or denom.lower() == 'nan': continue
 
                     if "TOTAL" in denom.upper():
@@ -159,7 +239,7 @@ class EmergencyMapper(BaseExcelMapper):
                     cant = self._parse_entero(cant_raw)
                     if cant > 0:
                         items.append(f"{denom}:{cant}")
-                except:
+                except Exception:
                     break
 
             info[tipo_kit]['valor'] = valor_total
@@ -168,12 +248,12 @@ class EmergencyMapper(BaseExcelMapper):
         return info
 
     def _parse_valor_monetario(self, val) -> Decimal:
-        if pd.isna(val) : return Decimal('0')
+        if pd.isna(val) : return _ZERO
         s = str(val).replace('$', '').replace(' ', '').replace('_', '').strip()
         try:
             return Decimal(s)
         except:
-            return Decimal('0')
+            return _ZERO
 
     def _parse_entero(self, val) -> int:
         try:
@@ -189,18 +269,9 @@ class EmergencyMapper(BaseExcelMapper):
 
         val_str = str(val).split()[0].strip()
 
-        formatos = [ 
-            '%Y-%m-%d', # 2026-03-28
-            '%d-%m-%Y', # 28-03-2026
-            '%d/%m/%Y', # 28/03/2026
-            '%Y/%m/%d'  # 2026/03/28
-        ]
+        fecha = _parse_fecha_str(val_str)
+        if fecha is not None:
+            return fecha
 
-        for fmt in formatos:
-            try:
-                return datetime.strptime(val_str, fmt).date()
-            except ValueError:
-                continue
-        
-        logger.warning(f"⚠️ No se pudo entender el formato de fecha '{val_str}'. Usando la de hoy.")
+        logger.warning("⚠️ No se pudo entender el formato de fecha %r. Usando la de hoy.", val_str)
         return date.today()
\ No newline at end of file
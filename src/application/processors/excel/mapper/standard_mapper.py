@@ -2,15 +2,128 @@ from __future__ import annotations
 from typing import List, Tuple, Dict, Any
 from datetime import datetime, date, time
 from decimal import Decimal
+import numpy as np
 import pandas as pd
 import logging
 import re
+from functools import lru_cache
 
 from src.application.interfaces.i_excel_mapper import BaseExcelMapper
 from src.application.dto.servicio_dto import AetherServiceImportDto
 
 logger = logging.getLogger(__name__)
 
+# Decimal cero compartido para los bucles por fila (Decimal es inmutable).
+_ZERO = Decimal('0')
+
+# Encabezados de denominación del formato oficina ('50000', '2000NF', ...).
+# Compilado una sola vez a nivel de módulo, no por fila.
+_PATRON_BILLETE = re.compile(r'^(\d+)(NF|AF|NUEVA|ANTIGUA)?$')
+
+
+@lru_cache(maxsize=128)
+def _validar_columnas(cols: tuple) -> tuple[bool, str]:
+    """Chequeo puro de columnas obligatorias, memoizado por tupla de columnas."""
+    faltantes = [col for col in StandardExcelMapper.COLUMNAS_BASE if col not in cols]
+    if faltantes:
+        if 'VALOR_TOTAL' in faltantes and any('KIT' in c for c in cols):
+            pass
+        else:
+            return (False, f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+
+    return (True, "")
+
+
+@lru_cache(maxsize=128)
+def _columnas_kits(cols: tuple) -> tuple:
+    """
+    Pares (num_kit, columna de cantidad) para una tupla de columnas,
+    memoizados: el escaneo KIT_i/CANT se hace una vez por esquema y no
+    20 veces por fila.
+    """
+    pares = []
+    for i in range(1, 21):
+        col = next((c for c in cols if f"KIT_{i}" in str(c).upper() and "CANT" in str(c).upper()), None)
+        if col is not None:
+            pares.append((i, col))
+    return tuple(pares)
+
+
+@lru_cache(maxsize=128)
+def _columnas_denominacion_oficina(cols: tuple) -> tuple:
+    """
+    Pares (columna, denominación) del formato oficina para una tupla de
+    columnas: la clasificación por regex se hace una vez por esquema en
+    lugar de columna por columna en cada fila.
+    """
+    pares = []
+    for c in cols:
+        col_str = str(c).upper().strip()
+
+        if col_str in StandardExcelMapper.COLUMNAS_BASE_SET or col_str in StandardExcelMapper.COLUMNAS_OPCIONALES_SET:
+            continue
+
+        match = _PATRON_BILLETE.match(col_str)
+        if match:
+            pares.append((c, int(match.group(1))))
+    return tuple(pares)
+
+
+@lru_cache(maxsize=128)
+def _columnas_atm(cols: tuple) -> tuple:
+    """
+    Tripletas (num, gaveta, deno, tipo o None) del formato ATM para una
+    tupla de columnas, memoizadas por esquema.
+    """
+    cols_set = set(cols)
+    tripletas = []
+    for i in range(1, 11):
+        col_gaveta, col_deno, col_tipo = f"GAVETA_{i}", f"DENO_{i}", f"TIPO_{i}"
+        if col_gaveta in cols_set and col_deno in cols_set:
+            tripletas.append((i, col_gaveta, col_deno, col_tipo if col_tipo in cols_set else None))
+    return tuple(tripletas)
+
+
+def _serie_enteros(s: pd.Series) -> np.ndarray:
+    """
+    Limpieza vectorizada equivalente a _parse_entero: quita ',' y '.' y
+    convierte a int64 en una pasada de pd.to_numeric.
+    """
+    limpio = s.astype(str).str.replace(',', '', regex=False).str.replace('.', '', regex=False)
+    return pd.to_numeric(limpio, errors='coerce').fillna(0).astype(np.int64).to_numpy()
+
+
+@lru_cache(maxsize=1024)
+def _parse_fecha_str(val_str: str) -> date:
+    """
+    Parseo de fecha memoizado: dentro de un archivo las fechas se repiten
+    muchísimo, así que cada cadena distinta paga el strptime una sola vez.
+    """
+    fecha_limpia = val_str.split(' ')[0]
+    for fmt in ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%Y/%m/%d'):
+        try:
+            return datetime.strptime(fecha_limpia, fmt).date()
+        except ValueError:
+            continue
+
+    raise ValueError(f"Fecha inválida: {val_str}")
+
+
+def _serie_monetaria(s: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Limpieza vectorizada equivalente a _parse_valor_monetario. Devuelve
+    las cadenas limpias (para construir Decimal exacto solo en las celdas
+    con valor) y su versión numérica para el chequeo de positividad.
+    """
+    limpio = (s.astype(str).str.strip()
+              .str.replace('$', '', regex=False)
+              .str.replace(' ', '', regex=False)
+              .str.replace('.', '', regex=False)
+              .str.replace(',', '.', regex=False))
+    nums = pd.to_numeric(limpio, errors='coerce').fillna(0.0).to_numpy()
+    return limpio.to_numpy(dtype=object), nums
+
+
 class StandardExcelMapper(BaseExcelMapper):
     """
     Mapper UNIVERSAL para el formato estándar.
@@ -30,12 +143,20 @@ class StandardExcelMapper(BaseExcelMapper):
         'OBSERVACION': None
     }
 
+    # Versiones frozenset para los chequeos de pertenencia en caliente.
+    COLUMNAS_BASE_SET = frozenset(COLUMNAS_BASE)
+    COLUMNAS_OPCIONALES_SET = frozenset(COLUMNAS_OPCIONALES)
+
     DEFAULT_USER_ID = "dda6d2ea-0a02-4f77-a063-04d940572a1a"
 
     def __init__(self, cod_cliente: str):
         self._cod_cliente = cod_cliente
         self._nombre_cliente = ""
         self.config_kits: Dict[str, Any] = {}
+        # Conversión única: int(cod_cliente) se repetía por cada DTO
+        self._cod_cliente_int = int(cod_cliente)
+        self._hora_solicitud = ""
+        self._tiene_col_fecha = False
     
     @property
     def cod_cliente(self) -> str:
@@ -70,9 +191,12 @@ class StandardExcelMapper(BaseExcelMapper):
 
                     self.config_kits[num_kit] = {
                         "VALOR": valor,
+                        # Valor entero precalculado para acumular con int en
+                        # el bucle caliente; None si el parámetro trae decimales.
+                        "VALOR_INT": int(valor) if valor == valor.to_integral_value() else None,
                         "TIPO": tipo
                     }
-                    logger.info(f"🔧 Configurado KIT_{num_kit}: ${valor:,.0f} ({tipo})")
+                    logger.info("🔧 Configurado KIT_%s: $%s (%s)", num_kit, f"{valor:,.0f}", tipo)
             
         except Exception as e:
             logger.error(f"Error al actualizar parámetros: {e}")
@@ -86,13 +210,15 @@ class StandardExcelMapper(BaseExcelMapper):
 
         df.columns = [str(col).upper().strip() for col in df.columns]
 
-        faltantes = [col for col in self.COLUMNAS_BASE if col not in df.columns]
-        if faltantes:
-            if 'VALOR_TOTAL' in faltantes and any('KIT' in c for c in df.columns):
-                pass
-            else:
-                return (False, f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+        # El veredicto depende solo del set de columnas: memoizado por tupla
+        # para que los libros multi-hoja con la misma estructura validen una vez.
+        return _validar_columnas(tuple(df.columns))
 
+    @staticmethod
+    def _validar_no_vacio(df: pd.DataFrame) -> tuple[bool, str]:
+        """Valida que el DataFrame tenga datos."""
+        if df is None or df.empty:
+            return (False, "La hoja no contiene datos")
         return (True, "")
 
     def obtener_resumen(self, df: pd.DataFrame) -> Dict[str, Any]:
@@ -120,59 +246,105 @@ class StandardExcelMapper(BaseExcelMapper):
         cols = df.columns
         es_formato_atm = 'GAVETA_1' in cols
         es_formato_kits = any('KIT' in col for col in cols)
-
-        for idx, row in df.iterrows():
-            raw_codigo = str(row.get('CODIGO') or row.get('COD. UNICO', '')).strip().lower()
+        kit_cols = _columnas_kits(tuple(cols)) if es_formato_kits else ()
+        atm_cols = _columnas_atm(tuple(cols)) if es_formato_atm else ()
+        deno_cols = () if (es_formato_kits or es_formato_atm) else _columnas_denominacion_oficina(tuple(cols))
+
+        # Bloques numéricos conocidos parseados de una sola pasada
+        # vectorizada (misma limpieza que _parse_entero y
+        # _parse_valor_monetario, pero en C) en lugar de celda a celda.
+        cant_kits_mat = gavetas_mat = denos_mat = deno_strs = deno_nums = None
+        if kit_cols:
+            cant_kits_mat = np.column_stack([_serie_enteros(df[c]) for _, c in kit_cols])
+        if atm_cols:
+            gavetas_mat = np.column_stack([_serie_enteros(df[g]) for _, g, _d, _t in atm_cols])
+            denos_mat = np.column_stack([_serie_enteros(df[d]) for _, _g, d, _t in atm_cols])
+        if deno_cols:
+            pares = [_serie_monetaria(df[c]) for c, _ in deno_cols]
+            deno_strs = np.column_stack([p[0] for p in pares])
+            deno_nums = np.column_stack([p[1] for p in pares])
+
+        # Una sola lectura de reloj por lote: todas las filas comparten la
+        # hora de solicitud, no hace falta un syscall + strftime por DTO.
+        self._hora_solicitud = datetime.now().strftime("%H:%M:%S")
+
+        # Columnas alternativas resueltas una vez por archivo: cuando la
+        # alterna no existe, el bucle por fila se ahorra el segundo row.get.
+        # Si ambas existen se conserva el fallback por valor (un CODIGO
+        # vacío sigue cayendo en COD. UNICO).
+        cols_set = set(cols)
+        tiene_cod_unico = 'COD. UNICO' in cols_set
+        self._tiene_col_fecha = 'FECHA' in cols_set
+
+        # to_dict('records') en vez de iterrows: dicts planos en una pasada,
+        # sin materializar una pd.Series (dtype + índice) por fila.
+        registros = df.to_dict('records')
+
+        for pos, (idx, row) in enumerate(zip(df.index, registros)):
+            if tiene_cod_unico:
+                raw_codigo = str(row.get('CODIGO') or row.get('COD. UNICO', '')).strip().lower()
+            else:
+                raw_codigo = str(row.get('CODIGO') or '').strip().lower()
             if not raw_codigo or raw_codigo == "nan": continue
 
             try:
                 if es_formato_kits:
-                    dto = self._procesar_fila_kits(row, nombre_archivo, idx)
+                    dto = self._procesar_fila_kits(row, nombre_archivo, idx, kit_cols, cant_kits_mat, pos)
                 elif es_formato_atm:
-                    dto = self._procesar_fila_atm(row, nombre_archivo, idx)
+                    dto = self._procesar_fila_atm(row, nombre_archivo, idx, atm_cols, gavetas_mat, denos_mat, pos)
                 else:
-                    dto = self._procesar_fila_oficina(row, nombre_archivo, idx)
+                    dto = self._procesar_fila_oficina(row, nombre_archivo, idx, deno_cols, deno_strs, deno_nums, pos)
                 
                 dtos.append((dto, idx))
 
             except Exception as e:
-                logger.error(f"Error al procesar fila {idx}: {str(e)}")
+                logger.error("Error al procesar fila %s: %s", idx, e)
 
         return dtos
 
-    def _procesar_fila_kits(self, row: pd.Series, nombre_archivo: str, idx: int) -> AetherServiceImportDto:
+    def _procesar_fila_kits(self, row: dict, nombre_archivo: str, idx: int, kit_cols: tuple, cant_mat, pos: int) -> AetherServiceImportDto:
         """
         Procesa una fila del formato de kits (paquetes)
         """
-        valor_moneda_total = Decimal(0)
-        valor_billete_total = Decimal(0)
+        # Acumuladores int para valores unitarios enteros (el caso normal en
+        # COP): aritmética nativa en el bucle y una sola conversión a Decimal
+        # al final. Los parámetros con decimales conservan la ruta Decimal.
+        moneda_i = 0
+        billete_i = 0
+        valor_moneda_total = _ZERO
+        valor_billete_total = _ZERO
         total_kits_count = 0
         detalle_kits = []
 
-        for i in range(1, 21):
-            col_encontrada = next((c for c in row.index if f"KIT_{i}" in str(c).upper() and "CANT" in str(c).upper()), None)
-            
-            if col_encontrada:
-                cantidad = self._parse_entero(row[col_encontrada])
-                if cantidad > 0:
-                    config = self.config_kits.get(str(i))
-                    if config:
-                        valor_unitario = config['VALOR']
-                        tipo = config['TIPO']
-
-                        subtotal = Decimal(cantidad) * valor_unitario
-                        total_kits_count += cantidad
+        for j, (i, _col) in enumerate(kit_cols):
+            cantidad = int(cant_mat[pos, j])
+            if cantidad > 0:
+                config = self.config_kits.get(str(i))
+                if config:
+                    tipo = config['TIPO']
+                    valor_int = config['VALOR_INT']
+                    total_kits_count += cantidad
 
+                    if valor_int is not None:
+                        if tipo == "MONEDA":
+                            moneda_i += cantidad * valor_int
+                        else:
+                            billete_i += cantidad * valor_int
+                    else:
+                        subtotal = Decimal(cantidad) * config['VALOR']
                         if tipo == "MONEDA":
                             valor_moneda_total += subtotal
-                        elif tipo == "BILLETE":
-                            valor_billete_total += subtotal
                         else:
                             valor_billete_total += subtotal
 
-                        detalle_kits.append(f"K{i}({tipo}):{cantidad}")
-                    else:
-                        logger.warning(f"Fila {idx}: Kit {i} tiene cantidad {cantidad} pero no está definido en PARAMETROS.")
+                    detalle_kits.append(f"K{i}({tipo}):{cantidad}")
+                else:
+                    logger.warning("Fila %s: Kit %s tiene cantidad %s pero no está definido en PARAMETROS.", idx, i, cantidad)
+
+        if moneda_i:
+            valor_moneda_total += Decimal(moneda_i)
+        if billete_i:
+            valor_billete_total += Decimal(billete_i)
 
         detalle = " | ".join(detalle_kits)
 
@@ -189,37 +361,35 @@ class StandardExcelMapper(BaseExcelMapper):
         )
 
     # ATM
-    def _procesar_fila_atm(self, row: pd.Series, nombre_archivo: str, idx: int) -> AetherServiceImportDto:
-        valor_calculado = Decimal(0)
+    def _procesar_fila_atm(self, row: dict, nombre_archivo: str, idx: int, atm_cols: tuple, gavetas_mat, denos_mat, pos: int) -> AetherServiceImportDto:
+        # Cantidades y denominaciones son enteros exactos: se acumula con
+        # int y se convierte a Decimal una sola vez al final.
+        valor_i = 0
         detalle_str = []
-        
-        for i in range(1, 11):
-            col_gaveta = f"GAVETA_{i}"
-            col_deno = f"DENO_{i}"
-            col_tipo = f"TIPO_{i}"
-            
-            if col_gaveta in row and col_deno in row:
-                try:
-                    cant = self._parse_entero(row[col_gaveta])
-                    deno = self._parse_entero(row[col_deno])
-                    tipo = ""
-                    
-                    if col_tipo in row.index and pd.notna(row[col_tipo]):
-                        tipo = str(row[col_tipo]).upper().strip()
-                    
-                    if cant > 0 and deno > 0:
-                        subtotal = Decimal(cant) * Decimal(deno)
-                        valor_calculado += subtotal
-
-                        info_extra = f"({tipo})" if tipo else ""
-                        detalle_str.append(f"G{i}{info_extra}: {cant}x{deno}")
-                except:
-                    continue
+
+        for j, (i, _col_gaveta, _col_deno, col_tipo) in enumerate(atm_cols):
+            try:
+                cant = int(gavetas_mat[pos, j])
+                deno = int(denos_mat[pos, j])
+                tipo = ""
+
+                if col_tipo is not None and pd.notna(row[col_tipo]):
+                    tipo = str(row[col_tipo]).upper().strip()
+
+                if cant > 0 and deno > 0:
+                    valor_i += cant * deno
+
+                    info_extra = f"({tipo})" if tipo else ""
+                    detalle_str.append(f"G{i}{info_extra}: {cant}x{deno}")
+            except:
+                continue
+
+        valor_calculado = Decimal(valor_i)
                 
         return self._crear_dtos(
             row=row,
             valor_billete=valor_calculado,
-            valor_moneda=Decimal('0'),
+            valor_moneda=_ZERO,
             es_atm=True,
             archivo=nombre_archivo,
             idx=idx,
@@ -227,30 +397,23 @@ class StandardExcelMapper(BaseExcelMapper):
         )
 
     # Oficina
-    def _procesar_fila_oficina(self, row: pd.Series, archivo: str, idx: int) -> AetherServiceImportDto:
-        valor_billete = Decimal('0')
-        valor_moneda = Decimal('0')
-        patron_billete = re.compile(r'^(\d+)(NF|AF|NUEVA|ANTIGUA)?$')
-
-        for col_name in row.index:
-            col_str = str(col_name).upper().strip()
-            
-            if col_str in self.COLUMNAS_BASE or col_str in self.COLUMNAS_OPCIONALES:
-                continue
-            
-            match = patron_billete.match(col_str)
-            if match:
+    def _procesar_fila_oficina(self, row: dict, archivo: str, idx: int, deno_cols: tuple, deno_strs, deno_nums, pos: int) -> AetherServiceImportDto:
+        valor_billete = _ZERO
+        valor_moneda = _ZERO
+
+        for j, (_col_name, deno) in enumerate(deno_cols):
+            # El chequeo de positividad usa la versión float vectorizada;
+            # el Decimal exacto solo se construye para celdas con valor.
+            if deno_nums[pos, j] > 0:
                 try:
-                    deno = int(match.group(1))
-                    valor = self._parse_valor_monetario(row[col_name])
-
-                    if valor > 0:
-                        if deno >= self.UMBRAL_BILLETE:
-                            valor_billete += valor
-                        else:
-                            valor_moneda += valor
+                    valor = Decimal(deno_strs[pos, j])
                 except:
                     continue
+
+                if deno >= self.UMBRAL_BILLETE:
+                    valor_billete += valor
+                else:
+                    valor_moneda += valor
         
         return self._crear_dtos(
             row=row,
@@ -272,7 +435,10 @@ class StandardExcelMapper(BaseExcelMapper):
             valor_final = self._parse_valor_monetario(row['VALOR_MONETARIO'])
             valor_billete = valor_final
         
-        fecha_serv = self._parse_fecha(row.get('FECHA_SERVICIO') or row.get('FECHA'))
+        if self._tiene_col_fecha:
+            fecha_serv = self._parse_fecha(row.get('FECHA_SERVICIO') or row.get('FECHA'))
+        else:
+            fecha_serv = self._parse_fecha(row.get('FECHA_SERVICIO'))
         fecha_sol = self._parse_fecha(row.get('FECHA_SOLICITUD'))
 
         modalidad_raw = str(row.get('MODALIDAD', '')).upper().strip()
@@ -288,10 +454,10 @@ class StandardExcelMapper(BaseExcelMapper):
         codigo_punto = str(row['CODIGO']).strip()
 
         return AetherServiceImportDto(
-            cod_cliente=int(self.cod_cliente),
+            cod_cliente=self._cod_cliente_int,
             cod_sucursal=1,
             fecha_solicitud=str(fecha_sol),
-            hora_solicitud=datetime.now().strftime("%H:%M:%S"),
+            hora_solicitud=self._hora_solicitud,
             cod_concepto=cod_con,
             cod_punto_origen=codigo_punto,
             cod_punto_destino="",
@@ -314,26 +480,15 @@ class StandardExcelMapper(BaseExcelMapper):
         if pd.isna(val) or str(val).strip() == '':
             raise ValueError("Fecha inválida")
 
-        val_str = str(val).strip()
-
         if isinstance(val, (datetime, pd.Timestamp)):
             return val.date()
-        
-        formatos = ['%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%Y/%m/%d']
 
-        for fmt in formatos:
-            try:
-                fecha_limpia = val_str.split(' ')[0]
-                return datetime.strptime(fecha_limpia, fmt).date()
-            except ValueError:
-                continue
-        
-        raise ValueError(f"Fecha inválida: {val_str}")
+        return _parse_fecha_str(str(val).strip())
 
     def _parse_valor_monetario(self, val) -> Decimal:
         """Intenta parsear valor monetario"""
-        if pd.isna(val): return Decimal('0')
-        
+        if pd.isna(val): return _ZERO
+
         s = str(val).strip()
         s = s.replace('$', '').replace(' ', '')
         s = s.replace('.', '').replace(',', '.')
@@ -341,7 +496,7 @@ class StandardExcelMapper(BaseExcelMapper):
         try:
             return Decimal(s)
         except:
-            return Decimal('0')
+            return _ZERO
 
     def _parse_entero(self, val) -> int:
         """Parsea cantidades enteras de forma segura"""
@@ -11,6 +11,10 @@ from os import name
 from pathlib import Path
 from typing import Optional
 
+# Caracteres no permitidos en nombres de carpeta (Windows). Se construye una
+# sola vez a nivel de módulo para no pagar la lista en cada __post_init__.
+_INVALID_FOLDER_CHARS = frozenset('/\\:*?"<>|')
+
 @dataclass(frozen=True)
 class ClienteFolder:
     """
@@ -25,16 +29,16 @@ class ClienteFolder:
 
     def __post_init__(self):
         """Validaciones de integridad"""
-        if not self.cod_cliente or not self.cod_cliente.strip():
+        # isspace() no asigna un string nuevo como sí lo hace strip()
+        if not self.cod_cliente or self.cod_cliente.isspace():
             raise ValueError("cod_cliente no puede estar vacio")
 
-        if not self.nombre_cliente or not self.nombre_cliente.strip():
+        if not self.nombre_cliente or self.nombre_cliente.isspace():
             raise ValueError("nombre_cliente no puede estar vacio")
 
-        invalid_chars = ['/', '\\', ':', '*', '?', '"', '<', '>', '|']
-        if any(char in self.nombre_cliente for char in invalid_chars):
+        if not _INVALID_FOLDER_CHARS.isdisjoint(self.nombre_cliente):
             raise ValueError(
-                f"nombre_cliente contiene caracteres inválidos: {invalid_chars}"
+                f"nombre_cliente contiene caracteres inválidos: {sorted(_INVALID_FOLDER_CHARS)}"
             )
 
     @classmethod
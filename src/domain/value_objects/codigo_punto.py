@@ -19,24 +19,24 @@ class CodigoPunto:
     valor: str
     
     def __post_init__(self):
-        if not self.valor or not self.valor.strip():
+        # isspace() cubre el caso "solo blancos" sin asignar un string nuevo;
+        # strip() se paga una única vez, solo para normalizar.
+        if not self.valor or self.valor.isspace():
             raise ValueError("El código de punto no puede estar vacío")
-        
-        # Normalizar y validar
-        valor_limpio = self.valor.strip()
-        
-        # Validación opcional: formato básico
-        if not valor_limpio:
-            raise ValueError("Código de punto inválido")
-        
-        object.__setattr__(self, 'valor', valor_limpio)
-    
+
+        valor = self.valor.strip()
+        object.__setattr__(self, 'valor', valor)
+        # Precalculada: __eq__ compara por parte numérica, así que en
+        # deduplicaciones se consultaría (y re-partiría el string) en cada
+        # comparación. rsplit con maxsplit=1 corta solo el último tramo.
+        object.__setattr__(self, '_parte_numerica', valor.rsplit('-', 1)[-1])
+
     @classmethod
     def from_raw(cls, codigo_raw: str) -> 'CodigoPunto':
         """Crea un CodigoPunto desde un código raw"""
         if not codigo_raw:
             raise ValueError("El código raw no puede estar vacío")
-        return cls(valor=codigo_raw.strip())
+        return cls(valor=codigo_raw)
     
     @property
     def parte_numerica(self) -> str:
@@ -48,9 +48,7 @@ class CodigoPunto:
             "0033" -> "0033"
             "XX-SUC-0033" -> "0033"
         """
-        if '-' in self.valor:
-            return self.valor.split('-')[-1]
-        return self.valor
+        return self._parte_numerica
     
     @property
     def codigo_cliente(self) -> Optional[str]:
@@ -101,9 +99,9 @@ class CodigoCliente:
     CLIENTES_PERMITIDOS = {"45", "46", "47", "48"}
     
     def __post_init__(self):
-        if not self.valor or not self.valor.strip():
+        if not self.valor or self.valor.isspace():
             raise ValueError("El código de cliente no puede estar vacío")
-        
+
         valor_limpio = self.valor.strip()
         object.__setattr__(self, 'valor', valor_limpio)
         
@@ -6,10 +6,13 @@ Watcher simple de directorio (pooling), sin dependencias externas.
 from __future__ import annotations
 from pathlib import Path
 from typing import Callable, Set
+import os
 import time
 import threading
 
 class DirectoryWatcher:
+    CARPETAS_EXCLUIDAS = frozenset({'gestionado', 'errores', 'novedades'})
+
     def __init__(self, directory: Path, on_new_file: Callable[[Path], None], debounce_ms: int = 800, interval_sec: float = 1.0):
         self._dir = directory
         self._on_new_file = on_new_file
@@ -21,18 +24,42 @@ class DirectoryWatcher:
     def _scan_once(self):
         if not self._dir.exists():
             self._dir.mkdir(parents=True, exist_ok=True)
-            
-        for p in self._dir.rglob('*.xlsx'):
-            if not p.is_file():
-                continue
 
-            if any(folder in p.parts for folder in ['gestionado', 'errores', 'novedades']):
+        nuevos: list[tuple[Path, int]] = []
+        # os.walk (scandir por debajo) en lugar de rglob: no se crea un Path
+        # ni se hace stat por entrada, y las carpetas excluidas se podan del
+        # recorrido en vez de filtrarse después de descender en ellas.
+        for raiz, dirs, archivos in os.walk(self._dir):
+            dirs[:] = [d for d in dirs if d not in self.CARPETAS_EXCLUIDAS]
+
+            for name in archivos:
+                if name.startswith('~$'):
+                    continue
+                if not name.lower().endswith(('.xlsx', '.xlsm')):
+                    continue
+                if name not in self._seen:
+                    p = Path(raiz) / name
+                    try:
+                        nuevos.append((p, p.stat().st_size))
+                    except OSError:
+                        continue
+
+        if not nuevos:
+            return
+
+        # Debounce por lote: una sola espera cubre todos los archivos nuevos
+        # del ciclo (en ráfagas de sincronización antes era espera × archivo).
+        time.sleep(min(self._debounce_ms, 500) / 1000.0)
+
+        for p, size_inicial in nuevos:
+            try:
+                if p.stat().st_size != size_inicial:
+                    # Todavía se está copiando: se reintenta en el próximo ciclo
+                    continue
+            except OSError:
                 continue
-                
-            name = p.name
-            if name not in self._seen:
-                self._seen.add(name)
-                self._on_new_file(p)
+            self._seen.add(p.name)
+            self._on_new_file(p)
 
     def start(self):
         def _loop():
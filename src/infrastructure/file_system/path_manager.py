@@ -5,23 +5,32 @@ class PathManager:
     def __init__(self):
         self.config = get_config()
         self.base_dir = Path(self.config.paths.base_dir)
-    
+        # Paths derivados cacheados: cada '/' sobre un Path aloca y normaliza,
+        # y estas rutas se piden varias veces por archivo procesado.
+        self._solicitudes_dir = self.base_dir / "solicitudes"
+        self._client_folders: dict[str, Path] = {}
+        self._estructuras_creadas: set[str] = set()
+
     def get_solicitudes_dir(self) -> Path:
         r"""Retorna C:\AetherCore\solicitudes"""
-        return self.base_dir / "solicitudes"
+        return self._solicitudes_dir
 
     def get_client_folder(self, client_name: str) -> Path:
         r"""Retorna C:\AetherCore\solicitudes\{cliente}"""
-        return self.get_solicitudes_dir() / client_name
+        folder = self._client_folders.get(client_name)
+        if folder is None:
+            folder = self._solicitudes_dir / client_name
+            self._client_folders[client_name] = folder
+        return folder
 
     def get_gestionado_path(self, client_name: str) -> Path:
         r"""Retorna C:\AetherCore\solicitudes\{cliente}\{solicitud}\gestionado"""
         return self.get_client_folder(client_name) / "gestionado"
-        
+
     def get_errores_path(self, client_name: str) -> Path:
         r"""Retorna C:\AetherCore\solicitudes\{cliente}\{solicitud}\errores"""
         return self.get_client_folder(client_name) / "errores"
-        
+
     def get_novedades_path(self, client_name: str) -> Path:
         r"""Retorna C:\AetherCore\solicitudes\{cliente}\{solicitud}\novedades"""
         return self.get_client_folder(client_name) / "novedades"
@@ -30,7 +39,12 @@ class PathManager:
         """
         Llama a este método justo antes de procesar un Excel.
         Se encargará de crear toda la ruta de carpetas en Windows si no existían.
+        Las estructuras ya creadas en este proceso no se re-verifican (cada
+        mkdir exist_ok vuelve a recorrer y statear el árbol completo).
         """
+        if client_name in self._estructuras_creadas:
+            return
         self.get_gestionado_path(client_name).mkdir(parents=True, exist_ok=True)
         self.get_errores_path(client_name).mkdir(parents=True, exist_ok=True)
-        self.get_novedades_path(client_name).mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+        self.get_novedades_path(client_name).mkdir(parents=True, exist_ok=True)
+        self._estructuras_creadas.add(client_name)
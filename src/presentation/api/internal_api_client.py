@@ -1,11 +1,16 @@
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 from src.application.dto.servicio_dto import AetherServiceImportDto
 
 class ApiService:
+    # Tamaño de sublote y tope de POSTs en vuelo para cargas grandes.
+    TAMANO_LOTE = 200
+    MAX_HILOS_CARGA = 4
+
     def __init__(self, base_url: str, username: str, password: str):
         self.base_url = base_url.rstrip('/')
         self.username = username
@@ -53,14 +58,53 @@ class ApiService:
     def upload_services(self, services: List[AetherServiceImportDto]) -> Optional[dict]:
         """
         Envía la lista de servicios al endpoint masivo asegurado con JWT.
+        Las cargas grandes se parten en sublotes enviados en paralelo: el
+        tiempo lo domina la latencia de red, así que varios POST en vuelo
+        aprovechan el ancho de banda en lugar de esperar uno a uno.
         """
         if not self.is_authenticated:
             if not self.login():
                 return None
-        
+
+        if len(services) <= self.TAMANO_LOTE:
+            return self._enviar_lote(services)
+
+        lotes = [services[i:i + self.TAMANO_LOTE] for i in range(0, len(services), self.TAMANO_LOTE)]
+        self.logger.info(f"Enviando {len(services)} servicios en {len(lotes)} lotes paralelos...")
+
+        with ThreadPoolExecutor(max_workers=min(self.MAX_HILOS_CARGA, len(lotes))) as pool:
+            resultados = list(pool.map(self._enviar_lote, lotes))
+
+        if all(resultado is None for resultado in resultados):
+            return None
+
+        # Se reconstruye una sola respuesta con los details en el orden de
+        # envío: los lotes caídos marcan sus filas como fallidas en lugar
+        # de descartar el archivo entero.
+        detalles = []
+        resumenes = []
+        for lote, resultado in zip(lotes, resultados):
+            if resultado is None:
+                detalles.extend(
+                    {"success": False, "message": "Error de red al enviar el lote"}
+                    for _ in lote
+                )
+            else:
+                detalles.extend(resultado.get('details') or resultado.get('Details') or [])
+                resumen = resultado.get('summary') or resultado.get('Summary')
+                if resumen:
+                    resumenes.append(str(resumen))
+
+        return {"summary": " | ".join(resumenes), "details": detalles}
+
+    def _enviar_lote(self, services: List[AetherServiceImportDto]) -> Optional[dict]:
+        """
+        POST de un lote al endpoint masivo (la sesión es compartida entre
+        hilos; requests.Session soporta POSTs concurrentes).
+        """
         endpoint = f"{self.base_url}/AetherCore/upload-services"
         payload = [s.to_dict() for s in services]
-        
+
         try:
             self.logger.info(f"Enviando {len(payload)} servicios al microservicio...")
             response = self.session.post(endpoint, json=payload, timeout=60, verify=False)
@@ -78,7 +122,9 @@ class ApiService:
             elif response.status_code == 401:
                 self.logger.warning("Token expirado (401). Reintentando login...")
                 self.is_authenticated = False
-                return self.upload_services(services)
+                if not self.login():
+                    return None
+                return self._enviar_lote(services)
             elif response.status_code in [301, 302, 307]:
                 self.logger.error(f"❌ El servidor intentó redireccionar a: {response.headers.get('Location')}")
                 return None